@@ -181,6 +181,52 @@ class OrbitEngine:
         
         return (x, y, z)
 
+    def get_planet_positions(self, planet: str, times: np.ndarray, tol: float = 1e-10, max_iter: int = 100) -> np.ndarray:
+        """Batched get_planet_position: returns an (N, 3) array for a 1-D array of times."""
+        if planet not in self.planets:
+            raise ValueError(f"Unknown planet: {planet}")
+
+        elem = self.planets[planet]
+        e = elem.e
+        t = np.asarray(times, dtype=np.float64).reshape(-1)
+
+        n = 360.0 / elem.period
+        M_rad = np.radians((elem.M0 + n * t) % 360)
+
+        # Newton iteration per element; converged entries are frozen exactly
+        # where the scalar solver would have stopped.
+        E_rad = M_rad.copy()
+        for _ in range(max_iter):
+            delta = E_rad - e * np.sin(E_rad) - M_rad
+            active = np.abs(delta) >= tol
+            if not active.any():
+                break
+            E_rad = np.where(active, E_rad - delta / (1 - e * np.cos(E_rad)), E_rad)
+
+        nu_rad = 2 * np.arctan2(np.sqrt(1 + e) * np.sin(E_rad / 2),
+                                np.sqrt(1 - e) * np.cos(E_rad / 2))
+        r = elem.a * (1 - e * np.cos(E_rad))
+
+        x_orb = r * np.cos(nu_rad)
+        y_orb = r * np.sin(nu_rad)
+
+        omega_rad = np.radians(elem.omega)
+        i_rad = np.radians(elem.i)
+        Omega_rad = np.radians(elem.Omega)
+
+        out = np.empty((t.shape[0], 3), dtype=np.float64)
+        out[:, 0] = x_orb * (np.cos(omega_rad) * np.cos(Omega_rad) - np.sin(omega_rad) * np.sin(Omega_rad) * np.cos(i_rad)) - \
+            y_orb * (np.sin(omega_rad) * np.cos(Omega_rad) + np.cos(omega_rad) * np.sin(Omega_rad) * np.cos(i_rad))
+        out[:, 1] = x_orb * (np.cos(omega_rad) * np.sin(Omega_rad) + np.sin(omega_rad) * np.cos(Omega_rad) * np.cos(i_rad)) - \
+            y_orb * (np.sin(omega_rad) * np.sin(Omega_rad) - np.cos(omega_rad) * np.cos(Omega_rad) * np.cos(i_rad))
+        out[:, 2] = x_orb * (np.sin(omega_rad) * np.sin(i_rad)) + y_orb * (np.cos(omega_rad) * np.sin(i_rad))
+        return out
+
+    def get_planet_positions_bulk(self, planets: List[str], times: np.ndarray) -> np.ndarray:
+        """Evaluate several planets on one time grid; returns a (P, N, 3) array."""
+        t = np.asarray(times, dtype=np.float64).reshape(-1)
+        return np.stack([self.get_planet_positions(planet, t) for planet in planets])
+
     def get_planet_velocity(self, planet: str, time_days: float) -> Tuple[float, float, float]:
         dt = 0.01  # Small time step
         pos1 = self.get_planet_position(planet, time_days)
@@ -302,15 +348,26 @@ class OrbitEngine:
             steps = int(math.ceil((t1 - t0) / dt_local))
             steps = max(1, steps)
 
+            # Hot loop (runs for every Lambert candidate): bind lookups locally, inline the distances.
+            sqrt = math.sqrt
+            transfer_position = self._get_transfer_position
+            planet_position = self.get_planet_position
+
             best = float("inf")
             for i in range(steps + 1):
                 t = t0 + (t1 - t0) * (i / steps)
-                ship = self._get_transfer_position(leg, t)
-                earth = self.get_planet_position("earth", t)
-                mars = self.get_planet_position("mars", t)
-
-                ce = self._dist3(ship, earth) - r_excl_earth
-                cm = self._dist3(ship, mars) - r_excl_mars
+                sx, sy, sz = transfer_position(leg, t)
+                ex, ey, ez = planet_position("earth", t)
+                mx, my, mz = planet_position("mars", t)
+
+                dx = sx - ex
+                dy = sy - ey
+                dz = sz - ez
+                ce = sqrt(dx * dx + dy * dy + dz * dz) - r_excl_earth
+                dx = sx - mx
+                dy = sy - my
+                dz = sz - mz
+                cm = sqrt(dx * dx + dy * dy + dz * dz) - r_excl_mars
                 if ce < best:
                     best = ce
                 if cm < best:
@@ -852,6 +909,14 @@ class OrbitEngine:
         pos, _vel = self._propagate_two_body(leg.pos_depart, leg.vel_depart, dt)
         return pos
 
+    def _get_transfer_positions(self, leg: TransferLeg, times: np.ndarray) -> np.ndarray:
+        """Batched _get_transfer_position: returns an (N, 3) array for a 1-D array of times."""
+        t = np.asarray(times, dtype=np.float64).reshape(-1)
+        out = np.empty((t.shape[0], 3), dtype=np.float64)
+        for i, time_days in enumerate(t.tolist()):
+            out[i] = self._get_transfer_position(leg, time_days)
+        return out
+
     def get_mission_phase(self, time_days: float) -> Tuple[MissionPhase, int, float]:
         """
         获取当前任务阶段
@@ -877,6 +942,45 @@ class OrbitEngine:
         
         return (phase, mission_number, time_in_mission)
 
+    def get_mission_phases(self, times: np.ndarray) -> Tuple[List[MissionPhase], np.ndarray, np.ndarray]:
+        """
+        Batched get_mission_phase for a 1-D array of times.
+
+        Returns:
+            (phases, mission_numbers, times_in_mission) — a list of MissionPhase plus int and float arrays.
+        """
+        t = np.asarray(times, dtype=np.float64).reshape(-1)
+        if t.shape[0] == 0:
+            return [], np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        self._ensure_schedules(float(t.max()), lookahead_missions=2)
+        if len(self._schedule_end_times) != len(self._schedules):
+            self._schedule_end_times = [float(s.leg_inbound.t_arrive) for s in self._schedules]
+
+        # Same lookup as _get_schedule_for_time, one searchsorted over all samples.
+        idx = np.searchsorted(np.asarray(self._schedule_end_times), np.maximum(t, 0.0), side='right')
+        idx = np.minimum(idx, len(self._schedules) - 1)
+
+        t_start = np.array([s.t_start for s in self._schedules])
+        boundaries = np.array(
+            [
+                (s.leg_outbound.t_depart, s.leg_outbound.t_arrive, s.leg_inbound.t_depart)
+                for s in self._schedules
+            ]
+        )
+        # Phase index = number of this schedule's phase boundaries already reached.
+        phase_idx = np.count_nonzero(t[:, None] >= boundaries[idx], axis=1)
+
+        phase_order = (
+            MissionPhase.EARTH_ORBIT_STAY,
+            MissionPhase.TRANSFER_TO_MARS,
+            MissionPhase.MARS_ORBIT_STAY,
+            MissionPhase.TRANSFER_TO_EARTH,
+        )
+        phases = [phase_order[i] for i in phase_idx.tolist()]
+        mission_numbers = np.array([s.mission_index for s in self._schedules], dtype=np.int64)[idx]
+        return phases, mission_numbers, t - t_start[idx]
+
     def get_spacecraft_position(self, time_days: float) -> Tuple[float, float, float]:
         phase, mission_number, time_in_mission = self.get_mission_phase(time_days)
         schedule = self._get_schedule_for_time(time_days)
@@ -911,6 +1015,19 @@ class OrbitEngine:
 
         raise RuntimeError(f"Unhandled mission phase: {phase}")
 
+    def get_spacecraft_positions(self, times: np.ndarray) -> np.ndarray:
+        """Batched get_spacecraft_position: returns an (N, 3) array for a 1-D array of times."""
+        t = np.asarray(times, dtype=np.float64).reshape(-1)
+        out = np.empty((t.shape[0], 3), dtype=np.float64)
+        if t.shape[0] == 0:
+            return out
+
+        # Generate every schedule the batch needs up front, then evaluate per sample.
+        self._ensure_schedules(float(t.max()), lookahead_missions=2)
+        for i, time_days in enumerate(t.tolist()):
+            out[i] = self.get_spacecraft_position(time_days)
+        return out
+
     def generate_orbit_points(self, planet: str, num_points: int = 360) -> List[Tuple[float, float, float]]:
         points = []
         period = self.planets[planet].period
@@ -5,34 +5,18 @@ from __future__ import annotations
 import math
 import sys
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Callable, List, Sequence, Tuple
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
 
 Vec2 = Tuple[float, float]
 Vec3 = Tuple[float, float, float]
 
-
-def v2_add(a: Vec2, b: Vec2) -> Vec2:
-    return (a[0] + b[0], a[1] + b[1])
-
-
-def v2_mul(a: Vec2, s: float) -> Vec2:
-    return (a[0] * s, a[1] * s)
-
-
-def v2_dot(a: Vec2, b: Vec2) -> float:
-    return a[0] * b[0] + a[1] * b[1]
-
-
-def v2_len(a: Vec2) -> float:
-    return math.hypot(a[0], a[1])
-
-
-def v2_unit(a: Vec2) -> Vec2:
-    n = v2_len(a)
-    if n == 0:
-        return (1.0, 0.0)
-    return (a[0] / n, a[1] / n)
+# SVG path command templates (%-formatting is cheaper than f-strings for bulk float output).
+_MOVE = "M %.2f %.2f"
+_CURVE = "C %.2f %.2f %.2f %.2f %.2f %.2f"
 
 
 def v3_xy(p: Vec3) -> Vec2:
@@ -47,45 +31,55 @@ def v3_dist(a: Vec3, b: Vec3) -> float:
 
 
 def dir_xy(p0: Vec3, p1: Vec3) -> Vec2:
-    d = (p1[0] - p0[0], p1[1] - p0[1])
-    n = v2_len(d)
+    dx = p1[0] - p0[0]
+    dy = p1[1] - p0[1]
+    n = math.hypot(dx, dy)
     if n == 0:
         return (0.0, 0.0)
-    return (d[0] / n, d[1] / n)
+    return (dx / n, dy / n)
 
 
 def angle_between_deg(a: Vec2, b: Vec2) -> float:
     if (a[0] == 0.0 and a[1] == 0.0) or (b[0] == 0.0 and b[1] == 0.0):
         return float("nan")
-    dot = v2_dot(a, b)
-    dot = max(-1.0, min(1.0, dot))
-    return math.degrees(math.acos(dot))
+    # atan2(|cross|, dot) stays accurate near 0 and 180 degrees, where acos(dot) loses precision.
+    cross = a[0] * b[1] - a[1] * b[0]
+    dot = a[0] * b[0] + a[1] * b[1]
+    return math.degrees(math.atan2(abs(cross), dot))
 
 
-def catmull_rom_spline_path(points_xy: List[Vec2]) -> str:
-    if len(points_xy) < 2:
+def catmull_rom_spline_path(points_xy: np.ndarray) -> str:
+    pts = np.asarray(points_xy, dtype=np.float64).reshape(-1, 2)
+    if pts.shape[0] < 2:
         return ""
 
-    pts = points_xy
-    padded = [pts[0]] + pts + [pts[-1]]
+    padded = np.vstack([pts[:1], pts, pts[-1:]])
+    p0 = padded[:-3]
+    p1 = padded[1:-2]
+    p2 = padded[2:-1]
+    p3 = padded[3:]
 
-    d: List[str] = [f"M {pts[0][0]:.2f} {pts[0][1]:.2f}"]
-    for k in range(len(pts) - 1):
-        p0 = padded[k]
-        p1 = padded[k + 1]
-        p2 = padded[k + 2]
-        p3 = padded[k + 3]
+    c1 = p1 + (p2 - p0) / 6.0
+    c2 = p2 - (p3 - p1) / 6.0
 
-        c1 = (p1[0] + (p2[0] - p0[0]) / 6.0, p1[1] + (p2[1] - p0[1]) / 6.0)
-        c2 = (p2[0] - (p3[0] - p1[0]) / 6.0, p2[1] - (p3[1] - p1[1]) / 6.0)
-        d.append(
-            f"C {c1[0]:.2f} {c1[1]:.2f} {c2[0]:.2f} {c2[1]:.2f} {p2[0]:.2f} {p2[1]:.2f}"
-        )
+    # One (N, 6) row per cubic segment: c1, c2, end point.
+    rows = np.hstack([c1, c2, p2]).tolist()
+    d: List[str] = [_MOVE % (pts[0, 0], pts[0, 1])]
+    d.extend(map(_CURVE.__mod__, map(tuple, rows)))
 
     return " ".join(d)
 
 
-def build_samples_by_count(pos_fn: Callable[[float], Vec3], t0: float, t1: float, *, n: int) -> List[Tuple[float, Vec3]]:
+@dataclass(frozen=True)
+class Samples:
+    t: np.ndarray  # (N,) sample times (days)
+    pos: np.ndarray  # (N, 3) positions (AU)
+
+    def __len__(self) -> int:
+        return int(self.t.shape[0])
+
+
+def sample_times_by_count(t0: float, t1: float, n: int) -> np.ndarray:
     steps = max(2, int(n))
     a = float(t0)
     b = float(t1)
@@ -93,31 +87,34 @@ def build_samples_by_count(pos_fn: Callable[[float], Vec3], t0: float, t1: float
         a, b = b, a
 
     dt = max(1e-9, b - a)
-    out: List[Tuple[float, Vec3]] = []
-    for i in range(steps):
-        s = i / (steps - 1)
-        t = a + dt * s
-        out.append((t, pos_fn(t)))
-    return out
+    return a + dt * (np.arange(steps) / (steps - 1))
 
 
-def build_samples_by_dt(pos_fn: Callable[[float], Vec3], t0: float, t1: float, *, dt_days: float) -> List[Tuple[float, Vec3]]:
+def build_samples_by_count_batched(
+    positions_fn: Callable[[np.ndarray], np.ndarray],
+    spans: Sequence[Tuple[float, float, int]],
+) -> List[Samples]:
+    """Sample several (t0, t1, n) spans of the same trajectory with one batched positions_fn call."""
+    times = [sample_times_by_count(t0, t1, n) for t0, t1, n in spans]
+    pos_all = np.asarray(positions_fn(np.concatenate(times)), dtype=np.float64).reshape(-1, 3)
+    offsets = np.cumsum([len(ts) for ts in times])[:-1]
+    return [Samples(t=ts, pos=pos) for ts, pos in zip(times, np.split(pos_all, offsets))]
+
+
+def build_samples_by_dt(positions_fn: Callable[[np.ndarray], np.ndarray], t0: float, t1: float, *, dt_days: float) -> Samples:
     dt = float(max(1e-9, dt_days))
     a = float(t0)
     b = float(t1)
     if b < a:
         a, b = b, a
 
-    samples: List[Tuple[float, Vec3]] = []
-    t = a
-    while t <= b + 1e-9:
-        samples.append((t, pos_fn(t)))
-        t += dt
-
-    if not samples or samples[-1][0] < b - 1e-9:
-        samples.append((b, pos_fn(b)))
+    # t_k = a + k * dt (no accumulated drift), always ending exactly at b.
+    ts = a + dt * np.arange(int((b - a + 1e-9) // dt) + 1)
+    if ts[-1] < b - 1e-9:
+        ts = np.append(ts, b)
 
-    return samples
+    pos = np.asarray(positions_fn(ts), dtype=np.float64).reshape(-1, 3)
+    return Samples(t=ts, pos=pos)
 
 
 @dataclass(frozen=True)
@@ -130,136 +127,118 @@ class DistanceReport:
     first_violation: str | None
 
 
-def check_no_penetration(engine, r_excl_earth: float, r_excl_mars: float, samples: Sequence[Tuple[float, Vec3]]) -> DistanceReport:
-    min_d_earth = float("inf")
-    min_d_mars = float("inf")
-    t_min_earth = float("nan")
-    t_min_mars = float("nan")
-
-    ok = True
-    first_violation: str | None = None
-
-    for t, ship in samples:
-        earth = engine.get_planet_position("earth", t)
-        mars = engine.get_planet_position("mars", t)
-
-        de = v3_dist(ship, earth)
-        dm = v3_dist(ship, mars)
-
-        if de < min_d_earth:
-            min_d_earth = de
-            t_min_earth = t
+@dataclass(frozen=True)
+class PlanetTable:
+    t: np.ndarray  # (N,) sorted, unique sample times (days)
+    earth: np.ndarray  # (N, 3)
+    mars: np.ndarray  # (N, 3)
 
-        if dm < min_d_mars:
-            min_d_mars = dm
-            t_min_mars = t
+    def lookup(self, ts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        ts = np.asarray(ts, dtype=np.float64).reshape(-1)
+        idx = np.minimum(np.searchsorted(self.t, ts), self.t.shape[0] - 1)
+        if not np.array_equal(self.t[idx], ts):
+            raise ValueError("sample times are not covered by the planet table")
+        return self.earth[idx], self.mars[idx]
 
-        if ok and (de < r_excl_earth or dm < r_excl_mars):
-            ok = False
-            if de < r_excl_earth:
-                first_violation = f"earth penetration at t={t:.3f} d={de:.4f} < r_excl={r_excl_earth:.4f}"
-            else:
-                first_violation = f"mars penetration at t={t:.3f} d={dm:.4f} < r_excl={r_excl_mars:.4f}"
 
-    if min_d_earth == float("inf"):
-        min_d_earth = 0.0
-        t_min_earth = float("nan")
+def build_planet_table(engine, sample_times: Sequence[np.ndarray]) -> PlanetTable:
+    ts = np.unique(np.concatenate([np.asarray(t, dtype=np.float64).reshape(-1) for t in sample_times]))
+    earth, mars = engine.get_planet_positions_bulk(["earth", "mars"], ts)
+    return PlanetTable(t=ts, earth=earth, mars=mars)
 
-    if min_d_mars == float("inf"):
-        min_d_mars = 0.0
-        t_min_mars = float("nan")
 
-    return DistanceReport(
-        ok=ok,
-        min_d_earth=min_d_earth,
-        t_min_earth=t_min_earth,
-        min_d_mars=min_d_mars,
-        t_min_mars=t_min_mars,
-        first_violation=first_violation,
+def lerp_samples(key_samples: Samples, substeps: int) -> Samples:
+    """Linearly interpolate substeps points per keyframe segment; shared endpoints are emitted once."""
+    substeps = max(2, int(substeps))
+    key_t = key_samples.t
+    key_pos = key_samples.pos
+    if key_t.shape[0] < 2:
+        return key_samples
+
+    dt = key_t[1:] - key_t[:-1]
+    seg = dt > 0
+    if not seg.any():
+        return Samples(t=np.empty(0), pos=np.empty((0, 3)))
+
+    t_a = key_t[:-1][seg]
+    p_a = key_pos[:-1][seg]
+    p_b = key_pos[1:][seg]
+    u = np.arange(substeps) / substeps
+
+    ts = (t_a[:, None] + dt[seg][:, None] * u[None, :]).ravel()
+    pos = (p_a[:, None, :] + (p_b - p_a)[:, None, :] * u[None, :, None]).reshape(-1, 3)
+
+    last = np.flatnonzero(seg)[-1] + 1
+    return Samples(
+        t=np.append(ts, key_t[last]),
+        pos=np.vstack([pos, key_pos[last]]),
     )
 
 
-def validate_linear_interpolation(
-    engine,
+def scan_clearance(
+    ts: np.ndarray,
+    ships: np.ndarray,
+    earth: np.ndarray,
+    mars: np.ndarray,
     r_excl_earth: float,
     r_excl_mars: float,
-    pos_fn: Callable[[float], Vec3],
-    t0: float,
-    t1: float,
-    *,
-    dt_frame: float,
-    substeps: int,
 ) -> DistanceReport:
-    dt_frame = float(max(1e-6, dt_frame))
-    substeps = max(2, int(substeps))
+    """Single pass over (N, 3) ship/planet arrays: running minima + first exclusion-zone violation."""
+    if ts.shape[0] == 0:
+        return DistanceReport(
+            ok=True,
+            min_d_earth=0.0,
+            t_min_earth=float("nan"),
+            min_d_mars=0.0,
+            t_min_mars=float("nan"),
+            first_violation=None,
+        )
 
-    key_samples = build_samples_by_dt(pos_fn, t0, t1, dt_days=dt_frame)
-    if len(key_samples) < 2:
-        return check_no_penetration(engine, r_excl_earth, r_excl_mars, key_samples)
+    rel_e = ships - earth
+    rel_m = ships - mars
+    de = np.sqrt(np.einsum("ij,ij->i", rel_e, rel_e))
+    dm = np.sqrt(np.einsum("ij,ij->i", rel_m, rel_m))
 
-    min_d_earth = float("inf")
-    min_d_mars = float("inf")
-    t_min_earth = float("nan")
-    t_min_mars = float("nan")
+    i_earth = int(de.argmin())
+    i_mars = int(dm.argmin())
 
-    ok = True
     first_violation: str | None = None
+    # argmax on a bool mask stops at the first True; no need to collect every violating index.
+    violated = (de < r_excl_earth) | (dm < r_excl_mars)
+    i = int(violated.argmax())
+    if violated[i]:
+        t = float(ts[i])
+        if de[i] < r_excl_earth:
+            first_violation = f"earth penetration at t={t:.3f} d={de[i]:.4f} < r_excl={r_excl_earth:.4f}"
+        else:
+            first_violation = f"mars penetration at t={t:.3f} d={dm[i]:.4f} < r_excl={r_excl_mars:.4f}"
 
-    for idx in range(len(key_samples) - 1):
-        t_a, p_a = key_samples[idx]
-        t_b, p_b = key_samples[idx + 1]
-        dt = float(t_b - t_a)
-        if dt <= 0:
-            continue
-
-        for j in range(substeps + 1):
-            u = j / substeps
-            t = t_a + dt * u
-            ship = (p_a[0] + (p_b[0] - p_a[0]) * u, p_a[1] + (p_b[1] - p_a[1]) * u, p_a[2] + (p_b[2] - p_a[2]) * u)
-
-            earth = engine.get_planet_position("earth", t)
-            mars = engine.get_planet_position("mars", t)
-
-            de = v3_dist(ship, earth)
-            dm = v3_dist(ship, mars)
-
-            if de < min_d_earth:
-                min_d_earth = de
-                t_min_earth = t
-
-            if dm < min_d_mars:
-                min_d_mars = dm
-                t_min_mars = t
+    return DistanceReport(
+        ok=first_violation is None,
+        min_d_earth=float(de[i_earth]),
+        t_min_earth=float(ts[i_earth]),
+        min_d_mars=float(dm[i_mars]),
+        t_min_mars=float(ts[i_mars]),
+        first_violation=first_violation,
+    )
 
-            if ok and (de < r_excl_earth or dm < r_excl_mars):
-                ok = False
-                if de < r_excl_earth:
-                    first_violation = f"earth penetration at t={t:.3f} d={de:.4f} < r_excl={r_excl_earth:.4f}"
-                else:
-                    first_violation = f"mars penetration at t={t:.3f} d={dm:.4f} < r_excl={r_excl_mars:.4f}"
 
-    if min_d_earth == float("inf"):
-        min_d_earth = 0.0
-        t_min_earth = float("nan")
+def check_no_penetration_vec(table: PlanetTable, r_excl_earth: float, r_excl_mars: float, ts: np.ndarray, ships: np.ndarray) -> DistanceReport:
+    ts = np.asarray(ts, dtype=np.float64).reshape(-1)
+    ships = np.asarray(ships, dtype=np.float64).reshape(-1, 3)
+    earth, mars = table.lookup(ts)
+    return scan_clearance(ts, ships, earth, mars, r_excl_earth, r_excl_mars)
 
-    if min_d_mars == float("inf"):
-        min_d_mars = 0.0
-        t_min_mars = float("nan")
 
-    return DistanceReport(
-        ok=ok,
-        min_d_earth=min_d_earth,
-        t_min_earth=t_min_earth,
-        min_d_mars=min_d_mars,
-        t_min_mars=t_min_mars,
-        first_violation=first_violation,
-    )
+def check_no_penetration(table: PlanetTable, r_excl_earth: float, r_excl_mars: float, samples: Samples) -> DistanceReport:
+    return check_no_penetration_vec(table, r_excl_earth, r_excl_mars, samples.t, samples.pos)
 
 
 def prograde_basis_xy(pos_xy: Vec2, vel_xy: Vec2) -> Tuple[Vec2, Vec2]:
-    r_hat = v2_unit(pos_xy)
+    n = math.hypot(pos_xy[0], pos_xy[1])
+    r_hat = (1.0, 0.0) if n == 0 else (pos_xy[0] / n, pos_xy[1] / n)
     t_hat = (-r_hat[1], r_hat[0])
-    if v2_dot(t_hat, vel_xy) < 0:
+    if t_hat[0] * vel_xy[0] + t_hat[1] * vel_xy[1] < 0:
         t_hat = (-t_hat[0], -t_hat[1])
     return r_hat, t_hat
 
@@ -312,99 +291,105 @@ def main() -> None:
     mars_park_arr_t1 = t_arr_m + params.mars_show_days
     mars_park_dep_t0 = max(t_arr_m, t_dep_me - params.mars_show_days)
 
-    ship_pos = engine.get_spacecraft_position
-
-    earth_park0 = build_samples_by_count(ship_pos, plot_t0, t_dep_em, n=params.n_parking)
-    out_transfer = build_samples_by_count(lambda tt: engine._get_transfer_position(schedule0.leg_outbound, tt), t_dep_em, t_arr_m, n=params.n_transfer)
-    mars_park_arr = build_samples_by_count(ship_pos, t_arr_m, mars_park_arr_t1, n=params.n_parking)
-    mars_park_dep = build_samples_by_count(ship_pos, mars_park_dep_t0, t_dep_me, n=params.n_parking)
-    in_transfer = build_samples_by_count(lambda tt: engine._get_transfer_position(schedule0.leg_inbound, tt), t_dep_me, t_arr_e, n=params.n_transfer)
-    earth_park2 = build_samples_by_count(ship_pos, t_arr_e, plot_t1, n=params.n_parking)
-
-    e_track = build_samples_by_count(lambda tt: engine.get_planet_position("earth", tt), plot_t0, plot_t1, n=params.n_track)
-    m_track = build_samples_by_count(lambda tt: engine.get_planet_position("mars", tt), plot_t0, plot_t1, n=params.n_track)
+    earth_park0, mars_park_arr, mars_park_dep, earth_park2 = build_samples_by_count_batched(
+        engine.get_spacecraft_positions,
+        [
+            (plot_t0, t_dep_em, params.n_parking),
+            (t_arr_m, mars_park_arr_t1, params.n_parking),
+            (mars_park_dep_t0, t_dep_me, params.n_parking),
+            (t_arr_e, plot_t1, params.n_parking),
+        ],
+    )
+    outbound_positions = partial(engine._get_transfer_positions, schedule0.leg_outbound)
+    inbound_positions = partial(engine._get_transfer_positions, schedule0.leg_inbound)
+
+    out_transfer, = build_samples_by_count_batched(outbound_positions, [(t_dep_em, t_arr_m, params.n_transfer)])
+    in_transfer, = build_samples_by_count_batched(inbound_positions, [(t_dep_me, t_arr_e, params.n_transfer)])
+
+    e_track, = build_samples_by_count_batched(partial(engine.get_planet_positions, "earth"), [(plot_t0, plot_t1, params.n_track)])
+    m_track, = build_samples_by_count_batched(partial(engine.get_planet_positions, "mars"), [(plot_t0, plot_t1, params.n_track)])
+
+    full_samples = build_samples_by_dt(engine.get_spacecraft_positions, plot_t0, plot_t1, dt_days=params.validate_dt_days)
+    # What a renderer lerping between keyframes dt_frame apart would show; keyframe times are a subset.
+    interp_samples = [
+        (
+            float(dt_frame),
+            lerp_samples(
+                build_samples_by_dt(engine.get_spacecraft_positions, plot_t0, plot_t1, dt_days=max(1e-6, float(dt_frame))),
+                params.interp_substeps,
+            ),
+        )
+        for dt_frame in params.interp_check_dt_days
+    ]
 
-    outbound_report = check_no_penetration(engine, r_excl_earth, r_excl_mars, out_transfer)
-    inbound_report = check_no_penetration(engine, r_excl_earth, r_excl_mars, in_transfer)
+    # Evaluate Earth/Mars once on the union of every sample time the checks below need.
+    planet_table = build_planet_table(
+        engine,
+        [out_transfer.t, in_transfer.t, full_samples.t] + [lerped.t for _, lerped in interp_samples],
+    )
 
-    full_samples = build_samples_by_dt(ship_pos, plot_t0, plot_t1, dt_days=params.validate_dt_days)
-    full_report = check_no_penetration(engine, r_excl_earth, r_excl_mars, full_samples)
+    outbound_report = check_no_penetration(planet_table, r_excl_earth, r_excl_mars, out_transfer)
+    inbound_report = check_no_penetration(planet_table, r_excl_earth, r_excl_mars, in_transfer)
+    full_report = check_no_penetration(planet_table, r_excl_earth, r_excl_mars, full_samples)
 
     interp_reports: List[Tuple[float, DistanceReport]] = []
-    for dt_frame in params.interp_check_dt_days:
-        interp_reports.append(
-            (float(dt_frame), validate_linear_interpolation(engine, r_excl_earth, r_excl_mars, ship_pos, plot_t0, plot_t1, dt_frame=float(dt_frame), substeps=params.interp_substeps))
-        )
+    for dt_frame, lerped in interp_samples:
+        interp_reports.append((dt_frame, check_no_penetration(planet_table, r_excl_earth, r_excl_mars, lerped)))
 
     dt_dir = 1e-3
 
-    def speed_dir_forward(pos_fn: Callable[[float], Vec3], t: float) -> Tuple[float, Vec2]:
-        p0 = pos_fn(t)
-        p1 = pos_fn(t + dt_dir)
-        return v3_dist(p0, p1) / dt_dir, dir_xy(p0, p1)
-
-    def speed_dir_backward(pos_fn: Callable[[float], Vec3], t: float) -> Tuple[float, Vec2]:
-        p0 = pos_fn(t - dt_dir)
-        p1 = pos_fn(t)
-        return v3_dist(p0, p1) / dt_dir, dir_xy(p0, p1)
-
-    v_park_e_dep, d_park_e_dep = speed_dir_forward(ship_pos, t_dep_em)
-    v_out0, d_out0 = speed_dir_forward(lambda tt: engine._get_transfer_position(schedule0.leg_outbound, tt), t_dep_em)
-
-    v_out1, d_out1 = speed_dir_backward(lambda tt: engine._get_transfer_position(schedule0.leg_outbound, tt), t_arr_m)
-    v_park_m_arr, d_park_m_arr = speed_dir_forward(ship_pos, t_arr_m)
-
-    v_park_m_dep, d_park_m_dep = speed_dir_backward(ship_pos, t_dep_me)
-    v_in0, d_in0 = speed_dir_forward(lambda tt: engine._get_transfer_position(schedule0.leg_inbound, tt), t_dep_me)
+    def speed_dir_pairs(pos: np.ndarray) -> List[Tuple[float, Vec2]]:
+        """Rows (p0, p1, p0, p1, ...) dt_dir apart -> one (speed, xy direction) per pair."""
+        rows = pos.tolist()
+        return [(v3_dist(p0, p1) / dt_dir, dir_xy(p0, p1)) for p0, p1 in zip(rows[0::2], rows[1::2])]
+
+    # Finite-difference pairs around each join: forward on the departing side, backward on the arriving side.
+    ship_join = engine.get_spacecraft_positions(
+        np.array([
+            t_dep_em, t_dep_em + dt_dir,
+            t_arr_m, t_arr_m + dt_dir,
+            t_dep_me - dt_dir, t_dep_me,
+            t_arr_e, t_arr_e + dt_dir,
+        ])
+    )
+    out_join = outbound_positions(np.array([t_dep_em, t_dep_em + dt_dir, t_arr_m - dt_dir, t_arr_m]))
+    in_join = inbound_positions(np.array([t_dep_me, t_dep_me + dt_dir, t_arr_e - dt_dir, t_arr_e]))
 
-    v_in1, d_in1 = speed_dir_backward(lambda tt: engine._get_transfer_position(schedule0.leg_inbound, tt), t_arr_e)
-    v_park_e_arr, d_park_e_arr = speed_dir_forward(ship_pos, t_arr_e)
+    (v_park_e_dep, d_park_e_dep), (v_park_m_arr, d_park_m_arr), (v_park_m_dep, d_park_m_dep), (v_park_e_arr, d_park_e_arr) = speed_dir_pairs(ship_join)
+    (v_out0, d_out0), (v_out1, d_out1) = speed_dir_pairs(out_join)
+    (v_in0, d_in0), (v_in1, d_in1) = speed_dir_pairs(in_join)
 
     deg_e_dep = angle_between_deg(d_park_e_dep, d_out0)
     deg_m_arr = angle_between_deg(d_out1, d_park_m_arr)
     deg_m_dep = angle_between_deg(d_park_m_dep, d_in0)
     deg_e_arr = angle_between_deg(d_in1, d_park_e_arr)
 
-    def v_norm(a: Vec3) -> float:
-        return math.sqrt(a[0] * a[0] + a[1] * a[1] + a[2] * a[2])
-
-    def v_sub(a: Vec3, b: Vec3) -> Vec3:
-        return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
-
     def dv_cost(leg) -> Tuple[float, float, float]:
         v_source = engine.get_planet_velocity(leg.source, leg.t_depart)
         v_target = engine.get_planet_velocity(leg.target, leg.t_arrive)
-        dv1 = v_norm(v_sub(leg.vel_depart, v_source))
-        dv2 = v_norm(v_sub(leg.vel_arrive, v_target))
+        dv = np.array([leg.vel_depart, leg.vel_arrive]) - np.array([v_source, v_target])
+        dv1, dv2 = np.linalg.norm(dv, axis=1).tolist()
         return dv1, dv2, dv1 + dv2
 
     dv_out = dv_cost(schedule0.leg_outbound)
     dv_in = dv_cost(schedule0.leg_inbound)
 
-    earth_park0_xy = [v3_xy(p) for _, p in earth_park0]
-    out_xy = [v3_xy(p) for _, p in out_transfer]
-    mars_park_arr_xy = [v3_xy(p) for _, p in mars_park_arr]
-    mars_park_dep_xy = [v3_xy(p) for _, p in mars_park_dep]
-    in_xy = [v3_xy(p) for _, p in in_transfer]
-    earth_park2_xy = [v3_xy(p) for _, p in earth_park2]
+    earth_park0_xy = earth_park0.pos[:, :2]
+    out_xy = out_transfer.pos[:, :2]
+    mars_park_arr_xy = mars_park_arr.pos[:, :2]
+    mars_park_dep_xy = mars_park_dep.pos[:, :2]
+    in_xy = in_transfer.pos[:, :2]
+    earth_park2_xy = earth_park2.pos[:, :2]
 
-    e_track_xy = [v3_xy(p) for _, p in e_track]
-    m_track_xy = [v3_xy(p) for _, p in m_track]
+    e_track_xy = e_track.pos[:, :2]
+    m_track_xy = m_track.pos[:, :2]
 
-    all_xy: List[Vec2] = []
-    all_xy += e_track_xy + m_track_xy
-    all_xy += earth_park0_xy + out_xy + mars_park_arr_xy + mars_park_dep_xy + in_xy + earth_park2_xy
-
-    xs = [p[0] for p in all_xy]
-    ys = [p[1] for p in all_xy]
-    xmin, xmax = min(xs), max(xs)
-    ymin, ymax = min(ys), max(ys)
+    xy_parts = [e_track_xy, m_track_xy, earth_park0_xy, out_xy, mars_park_arr_xy, mars_park_dep_xy, in_xy, earth_park2_xy]
+    all_xy = np.concatenate(xy_parts, axis=0)
 
     pad_world = 0.45
-    xmin -= pad_world
-    xmax += pad_world
-    ymin -= pad_world
-    ymax += pad_world
+    bbox = np.stack([all_xy.min(axis=0) - pad_world, all_xy.max(axis=0) + pad_world])
+    (xmin, ymin), (xmax, ymax) = bbox.tolist()
 
     W, H = 1000, 1000
     PAD = 40
@@ -417,8 +402,20 @@ def main() -> None:
         y = PAD + (ymax - p[1]) * scale
         return (x, y)
 
-    def spline_path(points_world: List[Vec2]) -> str:
-        return catmull_rom_spline_path([to_svg(p) for p in points_world])
+    # World -> SVG for every path point at once (y flipped), then split back per path.
+    all_svg = np.empty_like(all_xy)
+    all_svg[:, 0] = PAD + (all_xy[:, 0] - xmin) * scale
+    all_svg[:, 1] = PAD + (ymax - all_xy[:, 1]) * scale
+    (
+        e_track_svg,
+        m_track_svg,
+        earth_park0_svg,
+        out_svg,
+        mars_park_arr_svg,
+        mars_park_dep_svg,
+        in_svg,
+        earth_park2_svg,
+    ) = np.split(all_svg, np.cumsum([len(part) for part in xy_parts])[:-1])
 
     def circle(center_xy: Vec2, r_world: float, *, stroke: str, fill: str, fill_op: float = 0.18, dash: str | None = None) -> str:
         cx, cy = to_svg(center_xy)
@@ -431,31 +428,32 @@ def main() -> None:
             f'stroke="{stroke}" stroke-width="2" fill="{fill_attr}"{fill_op_attr}{dash_attr}/>'
         )
 
-    def dot_world(p_world: Vec2, *, fill: str, r_px: float = 4.0, fill_op: float = 1.0, stroke: str = "none", stroke_op: float = 1.0) -> str:
-        x, y = to_svg(p_world)
+    def dot_svg(x: float, y: float, *, fill: str, r_px: float = 4.0, fill_op: float = 1.0, stroke: str = "none", stroke_op: float = 1.0) -> str:
         return (
             f'<circle cx="{x:.2f}" cy="{y:.2f}" r="{r_px:.2f}" '
             f'fill="{fill}" fill-opacity="{fill_op:.3f}" stroke="{stroke}" stroke-opacity="{stroke_op:.3f}" stroke-width="1"/>'
         )
 
-    def timed_markers(points_world: List[Vec2], *, count: int, fill: str, fill_op: float) -> List[str]:
-        if count <= 2 or len(points_world) < 3:
+    def dot_world(p_world: Vec2, *, fill: str) -> str:
+        x, y = to_svg(p_world)
+        return dot_svg(x, y, fill=fill)
+
+    def timed_markers(points_svg: np.ndarray, *, count: int, fill: str, fill_op: float) -> List[str]:
+        """Evenly spaced markers along a path that is already in SVG pixel space."""
+        if count <= 2 or len(points_svg) < 3:
             return []
-        out: List[str] = []
-        last_idx = len(points_world) - 1
-        for i in range(1, count - 1):
-            idx = round(i * last_idx / (count - 1))
-            out.append(dot_world(points_world[idx], fill=fill, r_px=params.marker_r_px, fill_op=fill_op, stroke="#e2e8f0", stroke_op=0.85))
-        return out
-
-    def tangent_marker(planet: str, t: float, origin_world: Vec2, *, color: str) -> str:
-        pos = engine.get_planet_position(planet, t)
-        vel = engine.get_planet_velocity(planet, t)
+        last_idx = len(points_svg) - 1
+        idxs = [round(i * last_idx / (count - 1)) for i in range(1, count - 1)]
+        return [
+            dot_svg(x, y, fill=fill, r_px=params.marker_r_px, fill_op=fill_op, stroke="#e2e8f0", stroke_op=0.85)
+            for x, y in points_svg[idxs].tolist()
+        ]
+
+    def tangent_marker(origin_world: Vec2, pos: Vec3, vel: Vec3, *, color: str) -> str:
         _r_hat, t_hat = prograde_basis_xy(v3_xy(pos), v3_xy(vel))
-        p1 = origin_world
-        p2 = v2_add(origin_world, v2_mul(t_hat, params.tangent_marker_len))
-        a = to_svg(p1)
-        b = to_svg(p2)
+        tip = (origin_world[0] + t_hat[0] * params.tangent_marker_len, origin_world[1] + t_hat[1] * params.tangent_marker_len)
+        a = to_svg(origin_world)
+        b = to_svg(tip)
         return (
             f'<line x1="{a[0]:.2f}" y1="{a[1]:.2f}" x2="{b[0]:.2f}" y2="{b[1]:.2f}" '
             f'stroke="{color}" stroke-width="2" opacity="0.75"/>'
@@ -469,10 +467,20 @@ def main() -> None:
             parts.append(f"{dt_frame:g}d:{'OK' if rep.ok else 'FAIL'}(ΔE={margin_e:+.3f},ΔM={margin_m:+.3f})")
         return " ".join(parts)
 
-    e_dep_xy = v3_xy(engine.get_planet_position("earth", t_dep_em))
-    m_arr_xy = v3_xy(engine.get_planet_position("mars", t_arr_m))
-    m_dep_xy = v3_xy(engine.get_planet_position("mars", t_dep_me))
-    e_arr_xy = v3_xy(engine.get_planet_position("earth", t_arr_e))
+    # Planet (pos, vel) at the four join epochs, shared by the body circles and tangent markers.
+    join_states: Dict[Tuple[str, float], Tuple[Vec3, Vec3]] = {
+        key: (engine.get_planet_position(*key), engine.get_planet_velocity(*key))
+        for key in [("earth", t_dep_em), ("mars", t_arr_m), ("mars", t_dep_me), ("earth", t_arr_e)]
+    }
+    e_dep_state = join_states[("earth", t_dep_em)]
+    m_arr_state = join_states[("mars", t_arr_m)]
+    m_dep_state = join_states[("mars", t_dep_me)]
+    e_arr_state = join_states[("earth", t_arr_e)]
+
+    e_dep_xy = v3_xy(e_dep_state[0])
+    m_arr_xy = v3_xy(m_arr_state[0])
+    m_dep_xy = v3_xy(m_dep_state[0])
+    e_arr_xy = v3_xy(e_arr_state[0])
 
     ship_e_dep_xy = v3_xy(engine._outer_parking_point("earth", t_dep_em))
     ship_m_arr_xy = v3_xy(engine._outer_parking_point("mars", t_arr_m))
@@ -481,83 +489,86 @@ def main() -> None:
 
     stroke_edges = 'stroke-linecap="round" stroke-linejoin="round"'
 
-    svg_lines: List[str] = []
-    svg_lines.append(f'<svg xmlns="http://www.w3.org/2000/svg" width="{W}" height="{H}" viewBox="0 0 {W} {H}">')
-    svg_lines.append(f'<rect x="0" y="0" width="{W}" height="{H}" fill="#070b12"/>')
-    svg_lines.append('<style> .label{fill:#cfd7ff;font:14px ui-sans-serif,system-ui;} .sub{fill:#94a3b8;font:12px ui-sans-serif,system-ui;} </style>')
-
-    svg_lines.append(f'<path d="{spline_path(e_track_xy)}" {stroke_edges} stroke="#2b6cb0" stroke-width="1.2" fill="none" opacity="0.35"/>')
-    svg_lines.append(f'<path d="{spline_path(m_track_xy)}" {stroke_edges} stroke="#c05621" stroke-width="1.2" fill="none" opacity="0.35"/>')
-
-    svg_lines.append(f'<path d="{spline_path(earth_park0_xy)}" {stroke_edges} stroke="#60a5fa" stroke-width="2.4" fill="none" opacity="0.85"/>')
-    svg_lines.append(f'<path d="{spline_path(out_xy)}" {stroke_edges} stroke="#fbbf24" stroke-width="2.8" fill="none" opacity="0.95"/>')
-    svg_lines.append(f'<path d="{spline_path(mars_park_arr_xy)}" {stroke_edges} stroke="#fb7185" stroke-width="2.4" fill="none" opacity="0.60"/>')
-    svg_lines.append(f'<path d="{spline_path(mars_park_dep_xy)}" {stroke_edges} stroke="#fb7185" stroke-width="2.4" fill="none" opacity="0.85"/>')
-    svg_lines.append(f'<path d="{spline_path(in_xy)}" {stroke_edges} stroke="#34d399" stroke-width="2.8" fill="none" opacity="0.95"/>')
-    svg_lines.append(f'<path d="{spline_path(earth_park2_xy)}" {stroke_edges} stroke="#60a5fa" stroke-width="2.4" fill="none" opacity="0.85"/>')
-
-    svg_lines += timed_markers(earth_park0_xy, count=params.marker_count_parking, fill="#60a5fa", fill_op=0.60)
-    svg_lines += timed_markers(out_xy, count=params.marker_count_transfer, fill="#fbbf24", fill_op=0.75)
-    svg_lines += timed_markers(mars_park_arr_xy, count=params.marker_count_parking, fill="#fb7185", fill_op=0.58)
-    svg_lines += timed_markers(mars_park_dep_xy, count=params.marker_count_parking, fill="#fb7185", fill_op=0.60)
-    svg_lines += timed_markers(in_xy, count=params.marker_count_transfer, fill="#34d399", fill_op=0.75)
-    svg_lines += timed_markers(earth_park2_xy, count=params.marker_count_parking, fill="#60a5fa", fill_op=0.60)
-
-    svg_lines.append(circle(e_dep_xy, engine.earth_visual_r, stroke="#3b82f6", fill="#3b82f6", fill_op=0.18))
-    svg_lines.append(circle(e_dep_xy, r_excl_earth, stroke="#60a5fa", fill="none", dash="6 6"))
-    svg_lines.append(circle(m_arr_xy, engine.mars_visual_r, stroke="#ef4444", fill="#ef4444", fill_op=0.18))
-    svg_lines.append(circle(m_arr_xy, r_excl_mars, stroke="#fb7185", fill="none", dash="6 6"))
-    svg_lines.append(circle(m_dep_xy, engine.mars_visual_r, stroke="#ef4444", fill="#ef4444", fill_op=0.10))
-    svg_lines.append(circle(m_dep_xy, r_excl_mars, stroke="#fb7185", fill="none", dash="6 6"))
-    svg_lines.append(circle(e_arr_xy, engine.earth_visual_r, stroke="#3b82f6", fill="#3b82f6", fill_op=0.10))
-    svg_lines.append(circle(e_arr_xy, r_excl_earth, stroke="#60a5fa", fill="none", dash="6 6"))
-
-    svg_lines.append(dot_world(ship_e_dep_xy, fill="#fbbf24"))
-    svg_lines.append(dot_world(ship_m_arr_xy, fill="#fbbf24"))
-    svg_lines.append(dot_world(ship_m_dep_xy, fill="#34d399"))
-    svg_lines.append(dot_world(ship_e_arr_xy, fill="#34d399"))
-
-    svg_lines.append(tangent_marker("earth", t_dep_em, ship_e_dep_xy, color="#e2e8f0"))
-    svg_lines.append(tangent_marker("mars", t_arr_m, ship_m_arr_xy, color="#e2e8f0"))
-    svg_lines.append(tangent_marker("mars", t_dep_me, ship_m_dep_xy, color="#e2e8f0"))
-    svg_lines.append(tangent_marker("earth", t_arr_e, ship_e_arr_xy, color="#e2e8f0"))
-
-    svg_lines.append('<text x="24" y="32" class="label">Lambert transfer arcs + parking orbits (clearance-validated)</text>')
-    svg_lines.append(
-        f'<text x="24" y="54" class="sub">visual_r: earth={engine.earth_visual_r:.3f}, mars={engine.mars_visual_r:.3f}; safety_margin={engine.safety_margin:.3f}; ship_r={engine.spacecraft_collision_r:.3f}</text>'
-    )
-    svg_lines.append(
-        f'<text x="24" y="74" class="sub">parking_r: earth={engine.earth_parking_r:.3f} (P={engine.earth_parking_period_days:.1f}d), mars={engine.mars_parking_r:.3f} (P={engine.mars_parking_period_days:.1f}d)</text>'
-    )
-    svg_lines.append(
-        f'<text x="24" y="94" class="sub">Outbound min(dE)={outbound_report.min_d_earth:.3f}, min(dM)={outbound_report.min_d_mars:.3f}, OK={str(outbound_report.ok)}</text>'
-    )
-    svg_lines.append(
-        f'<text x="24" y="114" class="sub">Inbound  min(dE)={inbound_report.min_d_earth:.3f}, min(dM)={inbound_report.min_d_mars:.3f}, OK={str(inbound_report.ok)}</text>'
-    )
-    svg_lines.append(
-        f'<text x="24" y="134" class="sub">Full traj min(dE)={full_report.min_d_earth:.3f} (t={full_report.t_min_earth:.1f}), min(dM)={full_report.min_d_mars:.3f} (t={full_report.t_min_mars:.1f}), OK={str(full_report.ok)}</text>'
-    )
-    svg_lines.append(
-        f'<text x="24" y="154" class="sub">Linear lerp safety: {fmt_interp_summary(interp_reports)}</text>'
-    )
-    svg_lines.append(
-        f'<text x="24" y="174" class="sub">Join dir Δθ (deg, xy): Edep {deg_e_dep:.2f}, Marr {deg_m_arr:.2f}, Mdep {deg_m_dep:.2f}, Earr {deg_e_arr:.2f}</text>'
-    )
-    svg_lines.append(
-        f'<text x="24" y="194" class="sub">Join speeds AU/day: parkEdep {v_park_e_dep:.4f} vs out0 {v_out0:.4f}; out1 {v_out1:.4f} vs parkMarr {v_park_m_arr:.4f}</text>'
-    )
-    svg_lines.append(
-        f'<text x="24" y="214" class="sub">Join speeds AU/day: parkMdep {v_park_m_dep:.4f} vs in0 {v_in0:.4f}; in1 {v_in1:.4f} vs parkEarr {v_park_e_arr:.4f}</text>'
-    )
-    svg_lines.append(
-        f'<text x="24" y="234" class="sub">Lambert dv proxy (AU/day): out dv1={dv_out[0]:.4f} dv2={dv_out[1]:.4f} sum={dv_out[2]:.4f}; in dv1={dv_in[0]:.4f} dv2={dv_in[1]:.4f} sum={dv_in[2]:.4f}</text>'
-    )
-
-    svg_lines.append("</svg>")
-
     out_path = repo_root / "demo_trajectory_lambert.svg"
-    out_path.write_text("\n".join(svg_lines) + "\n", encoding="utf-8")
+    with out_path.open("w", encoding="utf-8") as svg_file:
+        def emit(*svg_lines: str) -> None:
+            for line in svg_lines:
+                svg_file.write(line)
+                svg_file.write("\n")
+
+        emit(f'<svg xmlns="http://www.w3.org/2000/svg" width="{W}" height="{H}" viewBox="0 0 {W} {H}">')
+        emit(f'<rect x="0" y="0" width="{W}" height="{H}" fill="#070b12"/>')
+        emit('<style> .label{fill:#cfd7ff;font:14px ui-sans-serif,system-ui;} .sub{fill:#94a3b8;font:12px ui-sans-serif,system-ui;} </style>')
+
+        emit(f'<path d="{catmull_rom_spline_path(e_track_svg)}" {stroke_edges} stroke="#2b6cb0" stroke-width="1.2" fill="none" opacity="0.35"/>')
+        emit(f'<path d="{catmull_rom_spline_path(m_track_svg)}" {stroke_edges} stroke="#c05621" stroke-width="1.2" fill="none" opacity="0.35"/>')
+
+        emit(f'<path d="{catmull_rom_spline_path(earth_park0_svg)}" {stroke_edges} stroke="#60a5fa" stroke-width="2.4" fill="none" opacity="0.85"/>')
+        emit(f'<path d="{catmull_rom_spline_path(out_svg)}" {stroke_edges} stroke="#fbbf24" stroke-width="2.8" fill="none" opacity="0.95"/>')
+        emit(f'<path d="{catmull_rom_spline_path(mars_park_arr_svg)}" {stroke_edges} stroke="#fb7185" stroke-width="2.4" fill="none" opacity="0.60"/>')
+        emit(f'<path d="{catmull_rom_spline_path(mars_park_dep_svg)}" {stroke_edges} stroke="#fb7185" stroke-width="2.4" fill="none" opacity="0.85"/>')
+        emit(f'<path d="{catmull_rom_spline_path(in_svg)}" {stroke_edges} stroke="#34d399" stroke-width="2.8" fill="none" opacity="0.95"/>')
+        emit(f'<path d="{catmull_rom_spline_path(earth_park2_svg)}" {stroke_edges} stroke="#60a5fa" stroke-width="2.4" fill="none" opacity="0.85"/>')
+
+        emit(*timed_markers(earth_park0_svg, count=params.marker_count_parking, fill="#60a5fa", fill_op=0.60))
+        emit(*timed_markers(out_svg, count=params.marker_count_transfer, fill="#fbbf24", fill_op=0.75))
+        emit(*timed_markers(mars_park_arr_svg, count=params.marker_count_parking, fill="#fb7185", fill_op=0.58))
+        emit(*timed_markers(mars_park_dep_svg, count=params.marker_count_parking, fill="#fb7185", fill_op=0.60))
+        emit(*timed_markers(in_svg, count=params.marker_count_transfer, fill="#34d399", fill_op=0.75))
+        emit(*timed_markers(earth_park2_svg, count=params.marker_count_parking, fill="#60a5fa", fill_op=0.60))
+
+        emit(circle(e_dep_xy, engine.earth_visual_r, stroke="#3b82f6", fill="#3b82f6", fill_op=0.18))
+        emit(circle(e_dep_xy, r_excl_earth, stroke="#60a5fa", fill="none", dash="6 6"))
+        emit(circle(m_arr_xy, engine.mars_visual_r, stroke="#ef4444", fill="#ef4444", fill_op=0.18))
+        emit(circle(m_arr_xy, r_excl_mars, stroke="#fb7185", fill="none", dash="6 6"))
+        emit(circle(m_dep_xy, engine.mars_visual_r, stroke="#ef4444", fill="#ef4444", fill_op=0.10))
+        emit(circle(m_dep_xy, r_excl_mars, stroke="#fb7185", fill="none", dash="6 6"))
+        emit(circle(e_arr_xy, engine.earth_visual_r, stroke="#3b82f6", fill="#3b82f6", fill_op=0.10))
+        emit(circle(e_arr_xy, r_excl_earth, stroke="#60a5fa", fill="none", dash="6 6"))
+
+        emit(dot_world(ship_e_dep_xy, fill="#fbbf24"))
+        emit(dot_world(ship_m_arr_xy, fill="#fbbf24"))
+        emit(dot_world(ship_m_dep_xy, fill="#34d399"))
+        emit(dot_world(ship_e_arr_xy, fill="#34d399"))
+
+        emit(tangent_marker(ship_e_dep_xy, *e_dep_state, color="#e2e8f0"))
+        emit(tangent_marker(ship_m_arr_xy, *m_arr_state, color="#e2e8f0"))
+        emit(tangent_marker(ship_m_dep_xy, *m_dep_state, color="#e2e8f0"))
+        emit(tangent_marker(ship_e_arr_xy, *e_arr_state, color="#e2e8f0"))
+
+        emit('<text x="24" y="32" class="label">Lambert transfer arcs + parking orbits (clearance-validated)</text>')
+        emit(
+            f'<text x="24" y="54" class="sub">visual_r: earth={engine.earth_visual_r:.3f}, mars={engine.mars_visual_r:.3f}; safety_margin={engine.safety_margin:.3f}; ship_r={engine.spacecraft_collision_r:.3f}</text>'
+        )
+        emit(
+            f'<text x="24" y="74" class="sub">parking_r: earth={engine.earth_parking_r:.3f} (P={engine.earth_parking_period_days:.1f}d), mars={engine.mars_parking_r:.3f} (P={engine.mars_parking_period_days:.1f}d)</text>'
+        )
+        emit(
+            f'<text x="24" y="94" class="sub">Outbound min(dE)={outbound_report.min_d_earth:.3f}, min(dM)={outbound_report.min_d_mars:.3f}, OK={str(outbound_report.ok)}</text>'
+        )
+        emit(
+            f'<text x="24" y="114" class="sub">Inbound  min(dE)={inbound_report.min_d_earth:.3f}, min(dM)={inbound_report.min_d_mars:.3f}, OK={str(inbound_report.ok)}</text>'
+        )
+        emit(
+            f'<text x="24" y="134" class="sub">Full traj min(dE)={full_report.min_d_earth:.3f} (t={full_report.t_min_earth:.1f}), min(dM)={full_report.min_d_mars:.3f} (t={full_report.t_min_mars:.1f}), OK={str(full_report.ok)}</text>'
+        )
+        emit(
+            f'<text x="24" y="154" class="sub">Linear lerp safety: {fmt_interp_summary(interp_reports)}</text>'
+        )
+        emit(
+            f'<text x="24" y="174" class="sub">Join dir Δθ (deg, xy): Edep {deg_e_dep:.2f}, Marr {deg_m_arr:.2f}, Mdep {deg_m_dep:.2f}, Earr {deg_e_arr:.2f}</text>'
+        )
+        emit(
+            f'<text x="24" y="194" class="sub">Join speeds AU/day: parkEdep {v_park_e_dep:.4f} vs out0 {v_out0:.4f}; out1 {v_out1:.4f} vs parkMarr {v_park_m_arr:.4f}</text>'
+        )
+        emit(
+            f'<text x="24" y="214" class="sub">Join speeds AU/day: parkMdep {v_park_m_dep:.4f} vs in0 {v_in0:.4f}; in1 {v_in1:.4f} vs parkEarr {v_park_e_arr:.4f}</text>'
+        )
+        emit(
+            f'<text x="24" y="234" class="sub">Lambert dv proxy (AU/day): out dv1={dv_out[0]:.4f} dv2={dv_out[1]:.4f} sum={dv_out[2]:.4f}; in dv1={dv_in[0]:.4f} dv2={dv_in[1]:.4f} sum={dv_in[2]:.4f}</text>'
+        )
+
+        emit("</svg>")
 
     print(f"Output: {out_path}")
     print(f"Schedule0 t_start={t_start:.3f} launch={t_dep_em:.3f} arr_mars={t_arr_m:.3f} dep_mars={t_dep_me:.3f} arr_earth={t_arr_e:.3f}")
@@ -1,7 +1,17 @@
+import functools
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import multiprocessing
+from dataclasses import dataclass
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 import matplotlib.animation as animation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 # --- Constants ---
 AU = 1.496e11  # Astronomical Unit in meters (Informational, not directly used in AU plots)
@@ -27,110 +37,198 @@ TOTAL_TRIP_DURATION_DAYS = EARTH_MARS_TRAVEL_DAYS + MARS_WAIT_DAYS + MARS_EARTH_
 SIMULATION_STEP_DAYS = 5  # Time step for calculation (adjust for speed vs smoothness)
 ANIMATION_FRAMES = int(TOTAL_TRIP_DURATION_DAYS / SIMULATION_STEP_DAYS)
 ANIMATION_INTERVAL_MS = 30 # milliseconds per frame (adjust animation speed)
+TRAJECTORY_TOLERANCE_AU = 0.005 # Max deviation allowed when decimating the drawn trajectory
 
 # --- Helper Functions ---
 
-def get_planet_position(radius_au, period_days, time_days):
-    """Calculates planet position on a circular orbit in the XY plane."""
-    # Ensure time_days is non-negative for calculation stability
-    time_days = max(time_days, 0)
-    angle = 2 * np.pi * (time_days / period_days)
-    x = radius_au * np.cos(angle)
-    y = radius_au * np.sin(angle)
-    z = 0.0
-    return np.array([x, y, z])
-
-def get_transfer_orbit_point(r1_au, r2_au, phase, start_pos, end_pos_at_arrival):
+def get_planet_positions(radius_au, period_days, times_days):
+    """Calculates (N, 3) planet positions on a circular orbit in the XY plane for an array of times."""
+    # Ensure times are non-negative for calculation stability
+    times_days = np.maximum(np.asarray(times_days, dtype=float), 0)
+    angles = 2 * np.pi * (times_days / period_days)
+    return np.column_stack([radius_au * np.cos(angles), radius_au * np.sin(angles), np.zeros_like(angles)])
+
+def rdp_keep_mask(points, epsilon):
+    """
+    Ramer-Douglas-Peucker decimation of an (N, 3) polyline.
+    Returns a boolean mask of the points to keep so that no dropped point is further than
+    epsilon from the simplified line. NaN rows (line breaks) and the ends of each finite run are kept.
+    """
+    points = np.asarray(points, dtype=float)
+    finite = np.isfinite(points).all(axis=1)
+    keep = ~finite
+    # Start with one (first, last) span per finite run between NaN breaks
+    run_edges = np.flatnonzero(np.diff(np.concatenate(([0], finite.astype(np.int8), [0]))))
+    spans = [(start, stop - 1) for start, stop in zip(run_edges[::2], run_edges[1::2])]
+    while spans:
+        first, last = spans.pop()
+        keep[first] = keep[last] = True
+        if last - first < 2:
+            continue
+        # Distance of the interior points to the segment first -> last
+        seg = points[last] - points[first]
+        rel = points[first + 1:last] - points[first]
+        seg_len2 = seg @ seg
+        if seg_len2 > 0:
+            rel = rel - np.clip(rel @ seg / seg_len2, 0.0, 1.0)[:, None] * seg
+        dist2 = np.einsum('ij,ij->i', rel, rel)
+        worst = int(np.argmax(dist2))
+        if dist2[worst] > epsilon * epsilon:
+            split = first + 1 + worst
+            spans.append((first, split))
+            spans.append((split, last))
+    return keep
+
+@dataclass(frozen=True)
+class LegParams:
+    """Per-leg constants of a simplified transfer ellipse; they depend only on the leg endpoints."""
+    semi_latus_au: float   # a(1-e^2) of the transfer ellipse
+    ecc: float             # Eccentricity
+    start_angle: float     # Heliocentric angle of the departure point (rad)
+    delta_angle: float     # Wrapped sweep from departure to arrival angle (rad)
+    outward: bool          # True when moving outwards (phase 0 at periapsis)
+    r_min_au: float        # Radius clamp, smaller of the two orbit radii
+    r_max_au: float        # Radius clamp, larger of the two orbit radii
+
+def make_leg_params(r1_au, r2_au, start_pos, end_pos_at_arrival):
     """
-    Calculates a point on a simplified transfer ellipse segment between two orbits.
-    phase is normalized time, 0 (start) to 1 (end).
+    Precomputes the transfer-ellipse constants for a leg between two orbits.
     start_pos is the actual starting position vector.
     end_pos_at_arrival is the calculated position vector of the target planet at the arrival time.
-    This uses geometric interpolation of angle and an approximate elliptical radius.
     """
-    # Ensure phase is clipped between 0 and 1
-    phase = np.clip(phase, 0.0, 1.0)
-
     # Calculate semi-major axis of the theoretical Hohmann transfer ellipse
     a = (r1_au + r2_au) / 2.0
 
     # Calculate start and end angles relative to the Sun (origin)
-    start_angle = np.arctan2(start_pos[1], start_pos[0])
-    end_angle_target = np.arctan2(end_pos_at_arrival[1], end_pos_at_arrival[0])
+    start_angle = math.atan2(start_pos[1], start_pos[0])
+    end_angle_target = math.atan2(end_pos_at_arrival[1], end_pos_at_arrival[0])
 
     # Handle angle wrapping for correct interpolation
     delta_angle = end_angle_target - start_angle
-    if delta_angle > np.pi:
-        delta_angle -= 2 * np.pi
-    elif delta_angle < -np.pi:
-        delta_angle += 2 * np.pi
-
-    # Interpolate the current angle
-    current_angle = start_angle + phase * delta_angle
+    if delta_angle > math.pi:
+        delta_angle -= 2 * math.pi
+    elif delta_angle < -math.pi:
+        delta_angle += 2 * math.pi
 
     # Calculate eccentricity based on perihelion/aphelion
-    if r1_au < r2_au: # Moving outwards (e.g., Earth to Mars)
-        rp = r1_au # Perihelion radius
-        ra = r2_au # Aphelion radius
-    else: # Moving inwards (e.g., Mars to Earth)
-        rp = r2_au
-        ra = r1_au
+    rp = min(r1_au, r2_au) # Perihelion radius
+    ra = max(r1_au, r2_au) # Aphelion radius
     c = (ra - rp) / 2.0 # Distance from center to focus
     ecc = c / a       # Eccentricity
 
+    return LegParams(
+        semi_latus_au=a * (1 - ecc**2),
+        ecc=ecc,
+        start_angle=start_angle,
+        delta_angle=delta_angle,
+        outward=r1_au < r2_au,
+        r_min_au=rp,
+        r_max_au=ra,
+    )
+
+def get_transfer_orbit_point(leg, phase, out=None):
+    """
+    Calculates a point on a simplified transfer ellipse segment described by leg (LegParams).
+    phase is normalized time, 0 (start) to 1 (end); a scalar or an array of phases.
+    This uses geometric interpolation of angle and an approximate elliptical radius.
+    Points are written into out ((3,) or (N, 3)) when given, else into a new array.
+    """
+    # Ensure phase is clipped between 0 and 1
+    phase = np.clip(phase, 0.0, 1.0)
+
+    # Interpolate the current angle
+    current_angle = leg.start_angle + phase * leg.delta_angle
+
     # Approximate the radius using the polar equation of an ellipse.
     # This part is a simplification, assuming the transfer is roughly half an ellipse
     # and aligning its axis approximately with the start/end points for visual purposes.
     # 'theta' in the polar equation is angle from periapsis. We approximate this.
-    if r1_au < r2_au: # Outward: phase 0 -> periapsis, phase 1 -> apoapsis
+    if leg.outward: # Outward: phase 0 -> periapsis, phase 1 -> apoapsis
         relative_angle_from_periapsis = phase * np.pi
     else: # Inward: phase 0 -> apoapsis, phase 1 -> periapsis
         relative_angle_from_periapsis = (1 - phase) * np.pi # Angle decreases from pi to 0
 
     # Polar equation: r = a(1-e^2) / (1 + e*cos(theta))
-    denominator = (1 + ecc * np.cos(relative_angle_from_periapsis))
+    denominator = (1 + leg.ecc * np.cos(relative_angle_from_periapsis))
     # Avoid division by zero or very small numbers
-    if abs(denominator) < 1e-9:
-        denominator = 1e-9 if denominator >= 0 else -1e-9
+    denominator = np.where(np.abs(denominator) < 1e-9, np.where(denominator >= 0, 1e-9, -1e-9), denominator)
 
-    r = a * (1 - ecc**2) / denominator
+    r = leg.semi_latus_au / denominator
 
     # Clamp radius to be between the start and end radii, preventing numerical issues
-    r = np.clip(r, min(r1_au, r2_au), max(r1_au, r2_au))
+    r = np.clip(r, leg.r_min_au, leg.r_max_au)
 
     # Calculate Cartesian coordinates
-    x = r * np.cos(current_angle)
-    y = r * np.sin(current_angle)
-    z = 0.0 # Keep motion in the XY plane
-    return np.array([x, y, z])
+    if out is None:
+        out = np.empty(np.shape(current_angle) + (3,)) # (3,) for a scalar phase, (N, 3) for an array
+    out[..., 0] = r * np.cos(current_angle)
+    out[..., 1] = r * np.sin(current_angle)
+    out[..., 2] = 0.0 # Keep motion in the XY plane
+    return out
 
 # --- Setup Plot ---
-fig = plt.figure(figsize=(10, 10))
-ax = fig.add_subplot(111, projection='3d')
-ax.set_facecolor('black')
-fig.patch.set_facecolor('black') # Set figure background color as well
-
-# Plot Sun
-ax.scatter([0], [0], [0], color='yellow', s=200, label='Sun', marker='o') # Explicit marker
-
-# Plot full orbits (more points for smoother circle)
-orbit_angles = np.linspace(0, 2 * np.pi, 300)
-earth_orbit_x = EARTH_RADIUS_AU * np.cos(orbit_angles)
-earth_orbit_y = EARTH_RADIUS_AU * np.sin(orbit_angles)
-mars_orbit_x = MARS_RADIUS_AU * np.cos(orbit_angles)
-mars_orbit_y = MARS_RADIUS_AU * np.sin(orbit_angles)
-ax.plot(earth_orbit_x, earth_orbit_y, [0]*300, color='deepskyblue', linestyle='--', linewidth=0.8, label='Earth Orbit', alpha=0.7)
-ax.plot(mars_orbit_x, mars_orbit_y, [0]*300, color='orangered', linestyle='--', linewidth=0.8, label='Mars Orbit', alpha=0.7)
-
-# Initialize plot elements for animation
-# Use `plot` which returns a list containing the Line3D object; trailing comma unpacks it.
-earth_pos_marker, = ax.plot([], [], [], 'o', color='blue', markersize=7, label='Earth')
-mars_pos_marker, = ax.plot([], [], [], 'o', color='red', markersize=6, label='Mars')
-ship_pos_marker, = ax.plot([], [], [], 'o', color='lime', markersize=5, label='Spacecraft')
-ship_trajectory_line, = ax.plot([], [], [], '-', color='lime', linewidth=1.5, alpha=0.8) # Slightly thicker line
-
-# Store trajectory points
-ship_trajectory_points = []
+def setup_scene(fig):
+    """
+    Draws the static scene (Sun, orbits, axes styling, legend) on fig.
+    Returns the 3D axes and the dynamic artists that draw_frame() updates.
+    """
+    ax = fig.add_subplot(111, projection='3d')
+    ax.set_facecolor('black')
+    fig.patch.set_facecolor('black') # Set figure background color as well
+
+    # Plot Sun
+    ax.scatter([0], [0], [0], color='yellow', s=200, label='Sun', marker='o') # Explicit marker
+
+    # Plot full orbits (more points for smoother circle)
+    # One unit circle shared by both rings, scaled per planet
+    orbit_angles = np.linspace(0, 2 * np.pi, 300)
+    orbit_cos, orbit_sin = np.cos(orbit_angles), np.sin(orbit_angles)
+    orbit_z = np.zeros_like(orbit_angles)
+    ax.plot(EARTH_RADIUS_AU * orbit_cos, EARTH_RADIUS_AU * orbit_sin, orbit_z, color='deepskyblue', linestyle='--', linewidth=0.8, label='Earth Orbit', alpha=0.7)
+    ax.plot(MARS_RADIUS_AU * orbit_cos, MARS_RADIUS_AU * orbit_sin, orbit_z, color='orangered', linestyle='--', linewidth=0.8, label='Mars Orbit', alpha=0.7)
+
+    # Initialize plot elements for animation
+    # Use `plot` which returns a list containing the Line3D object; trailing comma unpacks it.
+    earth_pos_marker, = ax.plot([], [], [], 'o', color='blue', markersize=7, label='Earth')
+    mars_pos_marker, = ax.plot([], [], [], 'o', color='red', markersize=6, label='Mars')
+    ship_pos_marker, = ax.plot([], [], [], 'o', color='lime', markersize=5, label='Spacecraft')
+    ship_trajectory_line, = ax.plot([], [], [], '-', color='lime', linewidth=1.5, alpha=0.8) # Slightly thicker line
+    # Title is an axes text artist (inside the axes bbox) so draw_frame() can return it for blitting
+    title_artist = ax.text2D(0.5, 0.98, "", transform=ax.transAxes, color='white', ha='center', va='top', fontsize=10)
+
+    # Axes limits, labels and legend
+    max_radius = MARS_RADIUS_AU * 1.2 # Set plot limits slightly larger than Mars orbit
+    ax.set_xlim([-max_radius, max_radius])
+    ax.set_ylim([-max_radius, max_radius])
+    ax.set_zlim([-max_radius, max_radius]) # Keep Z symmetric for better view, even if motion is 2D
+    ax.set_autoscale_on(False) # Limits are fixed; skip data-limit recomputation as artists change
+
+    # Set labels and ticks colors
+    ax.set_xlabel("X (AU)", color='white', labelpad=10)
+    ax.set_ylabel("Y (AU)", color='white', labelpad=10)
+    ax.set_zlabel("Z (AU)", color='white', labelpad=10)
+    ax.tick_params(axis='x', colors='white')
+    ax.tick_params(axis='y', colors='white')
+    ax.tick_params(axis='z', colors='white')
+
+    # Customize grid and panes color
+    ax.xaxis.pane.fill = False
+    ax.yaxis.pane.fill = False
+    ax.zaxis.pane.fill = False
+    ax.xaxis.pane.set_edgecolor('dimgray') # Darker gray for panes
+    ax.yaxis.pane.set_edgecolor('dimgray')
+    ax.zaxis.pane.set_edgecolor('dimgray')
+    ax.grid(color='gray', linestyle=':', linewidth=0.5)
+
+    # Setup Legend
+    legend = ax.legend(facecolor='darkslategray', labelcolor='white', fontsize=8, loc='upper right')
+    for text in legend.get_texts():
+        text.set_color("white") # Ensure legend text is white
+
+    # Set initial view angle (elevation, azimuth)
+    ax.view_init(elev=25., azim=45)
+
+    return ax, (earth_pos_marker, mars_pos_marker, ship_pos_marker, ship_trajectory_line, title_artist)
 
 # --- Define Simulation Timeline & Key Positions ---
 t_launch_earth = 0
@@ -140,142 +238,210 @@ t_arrival_earth = t_launch_mars + MARS_EARTH_TRAVEL_DAYS
 
 # Calculate planet positions AT THE KEY MOMENTS for transfer calculations
 # These are the *targets* for the transfer orbit function
-earth_pos_at_launch = get_planet_position(EARTH_RADIUS_AU, EARTH_PERIOD_DAYS, t_launch_earth)
-mars_pos_at_arrival = get_planet_position(MARS_RADIUS_AU, MARS_PERIOD_DAYS, t_arrival_mars)
-
-mars_pos_at_return_launch = get_planet_position(MARS_RADIUS_AU, MARS_PERIOD_DAYS, t_launch_mars)
-earth_pos_at_return_arrival = get_planet_position(EARTH_RADIUS_AU, EARTH_PERIOD_DAYS, t_arrival_earth)
-
-# --- Animation Function ---
-def update(frame):
-    current_time_days = frame * SIMULATION_STEP_DAYS
-
-    # Calculate current planet positions for this frame
-    earth_pos = get_planet_position(EARTH_RADIUS_AU, EARTH_PERIOD_DAYS, current_time_days)
-    mars_pos = get_planet_position(MARS_RADIUS_AU, MARS_PERIOD_DAYS, current_time_days)
-
-    # Determine spacecraft phase and calculate position
-    ship_pos = None # Initialize ship_pos
-    current_phase_label = ""
-
-    # Determine current phase and spacecraft position
-    if current_time_days < t_arrival_mars:
-        # Phase 1: Earth -> Mars Transfer
-        phase = (current_time_days - t_launch_earth) / EARTH_MARS_TRAVEL_DAYS
-        ship_pos = get_transfer_orbit_point(
-            EARTH_RADIUS_AU, MARS_RADIUS_AU, phase,
-            earth_pos_at_launch, mars_pos_at_arrival
-        )
-        current_phase_label = "Phase: Earth to Mars Transfer"
-        if not ship_trajectory_points or not np.allclose(ship_pos, ship_trajectory_points[-1]):
-             ship_trajectory_points.append(ship_pos)
-    elif current_time_days < t_launch_mars:
-        # Phase 2: Waiting on Mars surface (follow Mars)
-        ship_pos = mars_pos
-        wait_elapsed = current_time_days - t_arrival_mars
-        current_phase_label = f"Phase: On Mars ({wait_elapsed:.0f} / {MARS_WAIT_DAYS} days wait)"
-        # Append position only once when arriving or if Mars moves significantly between frames
-        if not ship_trajectory_points or not np.allclose(ship_pos, ship_trajectory_points[-1]):
-             ship_trajectory_points.append(ship_pos)
-    elif current_time_days <= t_arrival_earth:
-        # Phase 3: Mars -> Earth Transfer
-        phase = (current_time_days - t_launch_mars) / MARS_EARTH_TRAVEL_DAYS
-        ship_pos = get_transfer_orbit_point(
-            MARS_RADIUS_AU, EARTH_RADIUS_AU, phase,
-            mars_pos_at_return_launch, earth_pos_at_return_arrival
+# (one vectorized call per planet instead of a scalar call per key moment)
+earth_pos_at_launch, earth_pos_at_return_arrival = get_planet_positions(
+    EARTH_RADIUS_AU, EARTH_PERIOD_DAYS, [t_launch_earth, t_arrival_earth])
+mars_pos_at_arrival, mars_pos_at_return_launch = get_planet_positions(
+    MARS_RADIUS_AU, MARS_PERIOD_DAYS, [t_arrival_mars, t_launch_mars])
+
+# Transfer-ellipse constants for each leg, computed once
+outbound_leg = make_leg_params(EARTH_RADIUS_AU, MARS_RADIUS_AU, earth_pos_at_launch, mars_pos_at_arrival)
+inbound_leg = make_leg_params(MARS_RADIUS_AU, EARTH_RADIUS_AU, mars_pos_at_return_launch, earth_pos_at_return_arrival)
+
+# --- Precompute Planet Positions for Every Frame ---
+frame_times_days = np.arange(ANIMATION_FRAMES + 1) * SIMULATION_STEP_DAYS
+earth_xyz = get_planet_positions(EARTH_RADIUS_AU, EARTH_PERIOD_DAYS, frame_times_days)
+mars_xyz = get_planet_positions(MARS_RADIUS_AU, MARS_PERIOD_DAYS, frame_times_days)
+
+# --- Precompute Mission Phase for Every Frame ---
+# phase_id: 0 = Earth->Mars transfer, 1 = waiting on Mars, 2 = Mars->Earth transfer, 3 = back at Earth
+PHASE_LABELS = [
+    "Phase: Earth to Mars Transfer",
+    "Phase: On Mars ({wait_elapsed:.0f} / {wait_days} days wait)",
+    "Phase: Mars to Earth Transfer",
+    "Phase: Journey Complete (at Earth)",
+]
+# Sorted start times of phases 1..3; arrival day itself still belongs to the return transfer
+phase_boundaries_days = np.array([t_arrival_mars, t_launch_mars, np.nextafter(t_arrival_earth, np.inf)])
+phase_id = np.searchsorted(phase_boundaries_days, frame_times_days, side='right')
+# phase_frac: normalized progress (0..1) through the current phase
+phase_start = np.array([t_launch_earth, t_arrival_mars, t_launch_mars, t_arrival_earth])[phase_id]
+phase_length = np.array([EARTH_MARS_TRAVEL_DAYS, MARS_WAIT_DAYS, MARS_EARTH_TRAVEL_DAYS, 1])[phase_id] # Final phase has no end; frac clips to 1
+phase_frac = np.clip((frame_times_days - phase_start) / phase_length, 0.0, 1.0)
+
+# Full title text for every frame, formatted once
+frame_titles = [
+    f"Earth-Mars Round Trip Simulation\n"
+    f"Day: {day:.0f} / {TOTAL_TRIP_DURATION_DAYS:.0f}\n"
+    + PHASE_LABELS[phase].format(wait_elapsed=day - t_arrival_mars, wait_days=MARS_WAIT_DAYS)
+    for day, phase in zip(frame_times_days.tolist(), phase_id.tolist())
+]
+
+# --- Precompute Spacecraft Position for Every Frame ---
+# Phases are contiguous runs of frames, so each one is a slice and the legs write straight into ship_xyz
+phase_rows = np.searchsorted(phase_id, np.arange(len(PHASE_LABELS) + 1))
+outbound_frames, waiting_frames, inbound_frames, home_frames = (
+    slice(start, stop) for start, stop in zip(phase_rows[:-1], phase_rows[1:]))
+ship_xyz = np.empty_like(earth_xyz)
+# Phase 1: Earth -> Mars Transfer
+get_transfer_orbit_point(outbound_leg, phase_frac[outbound_frames], out=ship_xyz[outbound_frames])
+# Phase 2: Waiting on Mars surface (follow Mars)
+ship_xyz[waiting_frames] = mars_xyz[waiting_frames]
+# Phase 3: Mars -> Earth Transfer
+get_transfer_orbit_point(inbound_leg, phase_frac[inbound_frames], out=ship_xyz[inbound_frames])
+# Phase 4: Arrived back at Earth (follow Earth)
+ship_xyz[home_frames] = earth_xyz[home_frames]
+
+# Drop consecutive duplicate points from the drawn path with one squared-distance pass
+ship_steps = np.diff(ship_xyz, axis=0)
+keep_point = np.ones(len(ship_xyz), dtype=bool)
+keep_point[1:] = np.einsum('ij,ij->i', ship_steps, ship_steps) > 1e-20
+# While waiting the ship just rides Mars: keep the arrival point as an anchor and one row that
+# becomes a NaN line break, instead of tracing ~90 samples along Mars's own orbit
+waiting_idx = np.arange(waiting_frames.start, waiting_frames.stop)
+keep_point[waiting_idx[1:2]] = True  # The break row must survive the dedup above, or the NaN lands on the anchor
+keep_point[waiting_idx[2:]] = False
+# ship_path_xyz is the single (N, 3) trajectory buffer; ship_path_len[frame] is its valid length at
+# that frame. A per-frame length table (rather than an incrementing counter) keeps frames
+# random-access, so seeking and the parallel exporter below draw the same path.
+ship_path_xyz = ship_xyz[keep_point]
+ship_path_len = np.cumsum(keep_point)
+if len(waiting_idx) > 1:
+    ship_path_xyz[ship_path_len[waiting_idx[1]] - 1] = np.nan
+
+# Decimate the drawn path to what is visible (RDP); ship_visual_len[frame] counts the kept vertices
+# before that frame's newest path point, which is always drawn so the line ends at the spacecraft
+visual_vertex = np.flatnonzero(rdp_keep_mask(ship_path_xyz, TRAJECTORY_TOLERANCE_AU))
+ship_visual_len = np.searchsorted(visual_vertex, ship_path_len - 1)
+# Frames sharing a vertex count end on different newest points, so one prefix cannot serve them all.
+# Instead every frame's drawn vertices are laid end to end in one (3, total) float64 buffer with
+# contiguous per-axis rows; frame f draws the view ship_traj_cols[:, ship_traj_start[f]:ship_traj_stop[f]]
+traj_count = ship_visual_len + 1
+ship_traj_stop = np.cumsum(traj_count)
+ship_traj_start = ship_traj_stop - traj_count
+traj_frame = np.repeat(np.arange(len(traj_count)), traj_count)
+traj_slot = np.arange(ship_traj_stop[-1]) - ship_traj_start[traj_frame] # Position within its frame's run
+traj_row = np.where(traj_slot == ship_visual_len[traj_frame], ship_path_len[traj_frame] - 1,
+                    visual_vertex[np.minimum(traj_slot, len(visual_vertex) - 1)])
+ship_traj_cols = np.ascontiguousarray(ship_path_xyz[traj_row].T, dtype=np.float64)
+
+# --- Animation Functions ---
+def draw_frame(frame, artists):
+    """Points the dynamic artists from setup_scene() at this frame's positions and title; returns them."""
+    earth_pos_marker, mars_pos_marker, ship_pos_marker, ship_trajectory_line, title_artist = artists
+
+    # Look up this frame's planet and spacecraft positions as (1, 3) views
+    earth_pos = earth_xyz[frame:frame + 1]
+    mars_pos = mars_xyz[frame:frame + 1]
+    ship_pos = ship_xyz[frame:frame + 1]
+
+    # Update plot data for markers (1-element views into the precomputed arrays, no list boxing)
+    earth_pos_marker.set_data_3d(earth_pos[:, 0], earth_pos[:, 1], earth_pos[:, 2])
+    mars_pos_marker.set_data_3d(mars_pos[:, 0], mars_pos[:, 1], mars_pos[:, 2])
+    ship_pos_marker.set_data_3d(ship_pos[:, 0], ship_pos[:, 1], ship_pos[:, 2])
+
+    # Trajectory so far: this frame's run of decimated vertices plus the newest path point (a view, no copy)
+    traj_x, traj_y, traj_z = ship_traj_cols[:, ship_traj_start[frame]:ship_traj_stop[frame]]
+    ship_trajectory_line.set_data_3d(traj_x, traj_y, traj_z)
+
+    # Update title with current time and phase (pre-generated)
+    title_artist.set_text(frame_titles[frame])
+
+    # Return tuple of updated artists for blitting (title included)
+    return artists
+
+def playback_frames(fig, artists):
+    """Frame indices for playback; once they run out, the blitted artists return to normal drawing."""
+    yield from range(ANIMATION_FRAMES + 1) # Include the final frame
+    # Blitting marks the dynamic artists animated, which full redraws skip. FuncAnimation re-marks
+    # them after every draw_frame(), so clear the flag here, after the last frame, so the final
+    # state survives rotating or zooming the axes
+    for artist in artists:
+        artist.set_animated(False)
+    fig.canvas.draw_idle()
+
+# --- Optional Parallel Offline Export ---
+def _render_frame_range(out_dir, frames, dpi):
+    """Worker: draw each frame on a fresh off-screen Agg figure and save it as a numbered PNG."""
+    fig = Figure(figsize=(10, 10))
+    FigureCanvasAgg(fig)
+    _, artists = setup_scene(fig)
+    for frame in frames:
+        draw_frame(frame, artists)
+        fig.savefig(os.path.join(out_dir, f"frame_{frame:04d}.png"), dpi=dpi, facecolor=fig.get_facecolor())
+
+def render_frames_parallel(out_dir, n_jobs=None, dpi=150):
+    """
+    Renders every animation frame to out_dir/frame_NNNN.png using n_jobs worker processes.
+    Workers are spawned, so they never inherit the parent's GUI backend state: each one imports
+    this script (recomputing the position arrays, skipping the __main__ block) and renders its
+    contiguous block of frames on its own Agg figure.
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    spawn = multiprocessing.get_context("spawn")
+    workers = [
+        spawn.Process(target=_render_frame_range, args=(out_dir, block.tolist(), dpi))
+        for block in np.array_split(np.arange(ANIMATION_FRAMES + 1), n_jobs) if len(block)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    if any(worker.exitcode != 0 for worker in workers):
+        raise RuntimeError("A frame rendering worker failed; see its traceback above.")
+
+def render_parallel(out_path, n_jobs=None, fps=30, dpi=150):
+    """Renders frames in parallel, then stitches them into out_path with ffmpeg."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg not found on PATH; it is needed to encode the rendered frames.")
+    with tempfile.TemporaryDirectory() as frame_dir:
+        render_frames_parallel(frame_dir, n_jobs=n_jobs, dpi=dpi)
+        subprocess.run(
+            [ffmpeg, "-y", "-loglevel", "error", "-framerate", str(fps),
+             "-i", os.path.join(frame_dir, "frame_%04d.png"), "-pix_fmt", "yuv420p", out_path],
+            check=True,
         )
-        current_phase_label = "Phase: Mars to Earth Transfer"
-        if not ship_trajectory_points or not np.allclose(ship_pos, ship_trajectory_points[-1]):
-             ship_trajectory_points.append(ship_pos)
-    else:
-        # Phase 4: Arrived back at Earth (follow Earth)
-        ship_pos = earth_pos
-        current_phase_label = "Phase: Journey Complete (at Earth)"
-         # Append position only once when arriving or if Earth moves significantly
-        if not ship_trajectory_points or not np.allclose(ship_pos, ship_trajectory_points[-1]):
-             ship_trajectory_points.append(ship_pos)
-
-
-    # Update plot data for markers
-    earth_pos_marker.set_data_3d([earth_pos[0]], [earth_pos[1]], [earth_pos[2]])
-    mars_pos_marker.set_data_3d([mars_pos[0]], [mars_pos[1]], [mars_pos[2]])
-    if ship_pos is not None:
-        ship_pos_marker.set_data_3d([ship_pos[0]], [ship_pos[1]], [ship_pos[2]])
-
-    # Update trajectory line data
-    if len(ship_trajectory_points) > 1:
-        traj_array = np.array(ship_trajectory_points)
-        ship_trajectory_line.set_data_3d(traj_array[:, 0], traj_array[:, 1], traj_array[:, 2])
-    elif len(ship_trajectory_points) == 1:
-         ship_trajectory_line.set_data_3d([ship_trajectory_points[0][0]], [ship_trajectory_points[0][1]], [ship_trajectory_points[0][2]])
-
-    # Update title with current time and phase - THE VARIABLE IS ACCESSED CORRECTLY HERE
-    title_text = (f"Earth-Mars Round Trip Simulation\n"
-                  f"Day: {current_time_days:.0f} / {TOTAL_TRIP_DURATION_DAYS:.0f}\n"
-                  f"{current_phase_label}")
-    ax.set_title(title_text, color='white', fontsize=10) # This updates the title object
-
-    # Return tuple of updated artists for blitting (if enabled)
-    # Note: Title object is NOT returned, hence blit=True causes issues with title updates.
-    return earth_pos_marker, mars_pos_marker, ship_pos_marker, ship_trajectory_line
-
-# --- Setup Axes and Legend ---
-max_radius = MARS_RADIUS_AU * 1.2 # Set plot limits slightly larger than Mars orbit
-ax.set_xlim([-max_radius, max_radius])
-ax.set_ylim([-max_radius, max_radius])
-ax.set_zlim([-max_radius, max_radius]) # Keep Z symmetric for better view, even if motion is 2D
-
-# Set labels and ticks colors
-ax.set_xlabel("X (AU)", color='white', labelpad=10)
-ax.set_ylabel("Y (AU)", color='white', labelpad=10)
-ax.set_zlabel("Z (AU)", color='white', labelpad=10)
-ax.tick_params(axis='x', colors='white')
-ax.tick_params(axis='y', colors='white')
-ax.tick_params(axis='z', colors='white')
-
-# Customize grid and panes color
-ax.xaxis.pane.fill = False
-ax.yaxis.pane.fill = False
-ax.zaxis.pane.fill = False
-ax.xaxis.pane.set_edgecolor('dimgray') # Darker gray for panes
-ax.yaxis.pane.set_edgecolor('dimgray')
-ax.zaxis.pane.set_edgecolor('dimgray')
-ax.grid(color='gray', linestyle=':', linewidth=0.5)
-
-# Setup Legend
-legend = ax.legend(facecolor='darkslategray', labelcolor='white', fontsize=8, loc='upper right')
-for text in legend.get_texts():
-    text.set_color("white") # Ensure legend text is white
-
-# Set initial view angle (elevation, azimuth)
-ax.view_init(elev=25., azim=45)
 
 # --- Create and Run Animation ---
-# Adjust 'frames' if needed, ensure it covers the full duration
-# *** CHANGE: Set blit=False to ensure the title text updates correctly ***
-ani = animation.FuncAnimation(
-    fig=fig,
-    func=update,
-    frames=ANIMATION_FRAMES + 1, # Include the final frame
-    interval=ANIMATION_INTERVAL_MS,
-    blit=False,  # <--- Set to False to fix title update issue
-    repeat=False # Do not loop the animation
-)
-
-# To display the animation window:
-try:
-    plt.show()
-except Exception as e:
-    print(f"Could not display plot: {e}")
-    print("Ensure you have a graphical backend configured for matplotlib (e.g., TkAgg, Qt5Agg).")
-
-
-# To save the animation (requires ffmpeg or other writer installed):
-# print("Attempting to save animation... This might take a while.")
-# try:
-#     ani.save('earth_mars_round_trip.mp4', writer='ffmpeg', fps=30, dpi=150, progress_callback=lambda i, n: print(f'Saving frame {i+1}/{n}', end='\r'))
-#     print("\nAnimation saved as earth_mars_round_trip.mp4")
-# except Exception as e:
-#     print(f"\nError saving animation: {e}")
-#     print("Ensure ffmpeg is installed and accessible in your system's PATH.")
-#     print("You might need to install it (e.g., 'conda install ffmpeg' or 'sudo apt install ffmpeg').")
\ No newline at end of file
+if __name__ == "__main__":
+    fig = plt.figure(figsize=(10, 10))
+    _, dynamic_artists = setup_scene(fig)
+
+    # Adjust 'frames' if needed, ensure it covers the full duration
+    ani = animation.FuncAnimation(
+        fig=fig,
+        func=draw_frame,
+        fargs=(dynamic_artists,),
+        init_func=lambda: dynamic_artists, # Blit setup: hand back the artists as created, so frame 0 is not rendered twice
+        frames=functools.partial(playback_frames, fig, dynamic_artists),
+        save_count=ANIMATION_FRAMES + 1, # Frame count for ani.save, which cannot size a generator
+        interval=ANIMATION_INTERVAL_MS,
+        # Blitting caches the static scene (Sun, orbits, panes, legend) as a background bitmap once
+        # (re-captured on resize); each frame restores it and redraws only the returned dynamic artists.
+        # Once playback ends, playback_frames() returns those artists to full redraws
+        blit=True,
+        repeat=False, # Do not loop the animation
+        cache_frame_data=False # Frames are plain indices into the precomputed arrays
+    )
+
+    # To display the animation window:
+    try:
+        plt.show()
+    except Exception as e:
+        print(f"Could not display plot: {e}")
+        print("Ensure you have a graphical backend configured for matplotlib (e.g., TkAgg, Qt5Agg).")
+
+
+    # To save the animation (requires ffmpeg or other writer installed):
+    # print("Attempting to save animation... This might take a while.")
+    # try:
+    #     ani.save('earth_mars_round_trip.mp4', writer='ffmpeg', fps=30, dpi=150, progress_callback=lambda i, n: print(f'Saving frame {i+1}/{n}', end='\r'))
+    #     print("\nAnimation saved as earth_mars_round_trip.mp4")
+    # except Exception as e:
+    #     print(f"\nError saving animation: {e}")
+    #     print("Ensure ffmpeg is installed and accessible in your system's PATH.")
+    #     print("You might need to install it (e.g., 'conda install ffmpeg' or 'sudo apt install ffmpeg').")
+
+    # Faster export: render frames on all cores, then encode with ffmpeg:
+    # render_parallel('earth_mars_round_trip.mp4', fps=30, dpi=150)
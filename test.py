@@ -3,23 +3,119 @@
 Test script for Mars Mission 3D Visualization
 """
 
+import argparse
+import importlib.util
+import io
+import json
 import math
+import os
+import subprocess
 import sys
-sys.path.insert(0, 'backend')
+import threading
+import traceback
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 
-def test_orbit_engine():
-    print("Testing Orbit Engine...")
+# Third-party dependencies are probed in a child interpreter, so modules only needed for their
+# version string (uvicorn, websockets) are never loaded into the test process
+_DEPENDENCIES = [
+    ("numpy", "NumPy"),
+    ("fastapi", "FastAPI"),
+    ("uvicorn", "Uvicorn"),
+    ("websockets", "WebSockets"),
+]
+
+_PROBE_SCRIPT = """
+import importlib, json, sys
+found = {}
+for name in sys.argv[1:]:
     try:
-        from orbit_engine import OrbitEngine
+        module = importlib.import_module(name)
+    except ImportError as e:
+        found[name] = {"error": str(e)}
+        continue
+    version = getattr(module, "__version__", None)
+    if not version:
+        try:
+            from importlib.metadata import version as pkg_version
+            version = pkg_version(name)
+        except Exception:
+            version = "unknown"
+    found[name] = {"version": version}
+print(json.dumps(found))
+"""
+
+def _probe_dependencies(modules):
+    """Imports modules in one child process; returns {name: {"version": ...} or {"error": ...}}."""
+    proc = subprocess.run([sys.executable, "-c", _PROBE_SCRIPT, *modules], capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Dependency probe failed: {proc.stderr.strip()}")
+    return json.loads(proc.stdout)
+
+# Backend modules are loaded straight from their files instead of putting backend/ on sys.path
+_BACKEND_DIR = 'backend'
+_backend_lock = threading.Lock()
+
+def _load_backend_module(name):
+    """Loads backend/<name>.py once, registered in sys.modules so later imports of it resolve directly."""
+    with _backend_lock:  # Tests run concurrently; never expose a half-executed module
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+        spec = importlib.util.spec_from_file_location(name, os.path.join(_BACKEND_DIR, f"{name}.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+        return module
+
+# Tests that only run when all of their prerequisites passed
+_PREREQUISITES = {
+    "Orbit Engine": ["Dependencies"],
+    "FastAPI": ["Dependencies"],
+}
+
+# Constant summary fragments, written with sys.stdout.write
+_RULE = "=" * 60 + "\n"
+_PASS = "✅ PASS\n"
+_FAIL = "❌ FAIL\n"
+_SKIP = "⏭️  SKIP\n"
+_ALL_PASSED = (
+    "🎉 All tests passed! System is ready to run.\n"
+    "\n"
+    "To start the application, run:\n"
+    "  ./start.sh\n"
+    "  or\n"
+    "  cd backend && python3 main.py\n"
+)
+_SOME_FAILED = "⚠️  Some tests failed. Please fix the issues above.\n"
+
+def test_orbit_engine(out=None):
+    print("Testing Orbit Engine...", file=out)
+    try:
+        OrbitEngine = _load_backend_module('orbit_engine').OrbitEngine
         engine = OrbitEngine()
         
-        # Test planet positions
-        earth_pos = engine.get_planet_position('earth', 0)
-        mars_pos = engine.get_planet_position('mars', 0)
-        
-        print(f"  ✅ Earth position at t=0: {earth_pos}")
-        print(f"  ✅ Mars position at t=0: {mars_pos}")
+        # Test planet positions (one bulk table; every row must match the scalar path)
+        planets = ['earth', 'mars']
+        batch_times = [0.0, 123.4, 500.0, 1234.5]
+        ephemeris = engine.get_planet_positions_bulk(planets, batch_times)
+        earth_pos = tuple(ephemeris[0][0].tolist())
+        mars_pos = tuple(ephemeris[1][0].tolist())
         
+        print(f"  ✅ Earth position at t=0: {earth_pos}", file=out)
+        print(f"  ✅ Mars position at t=0: {mars_pos}", file=out)
+
+        for planet, rows in zip(planets, ephemeris):
+            for t, row in zip(batch_times, rows):
+                miss = math.dist(row, engine.get_planet_position(planet, t))
+                if miss > 1e-9:
+                    raise AssertionError(f"Batched {planet} position at t={t} differs by {miss:.3e} AU")
+        print("  ✅ Batched planet positions match scalar path", file=out)
+
         # Test mission phases (relative to the dynamically generated schedule).
         schedule = engine._get_schedule_for_time(0.0)
         t_start = schedule.t_start
@@ -43,17 +139,30 @@ def test_orbit_engine():
             t_dep_mars + 1.0,
             max(t_start, t_arr_earth - 1.0),
         ]
-        for t in sample_times:
-            phase, mission_number, time_in_mission = engine.get_mission_phase(t)
-            print(f"  ✅ Phase at day {t:.1f}: {phase.value} (mission={mission_number}, t={time_in_mission:.1f})")
+        phases, mission_numbers, times_in_mission = engine.get_mission_phases(sample_times)
+        for t, phase, mission_number, time_in_mission in zip(sample_times, phases, mission_numbers, times_in_mission):
+            print(f"  ✅ Phase at day {t:.1f}: {phase.value} (mission={mission_number}, t={time_in_mission:.1f})", file=out)
+
+        # Batched phases must match the scalar path, including across later missions.
+        phase_times = sample_times + [t_arr_earth + 1.0, t_arr_earth + 400.0, -5.0]
+        for t, phase, mission_number, time_in_mission in zip(phase_times, *engine.get_mission_phases(phase_times)):
+            if (phase, mission_number, time_in_mission) != engine.get_mission_phase(t):
+                raise AssertionError(f"Batched mission phase at t={t:.3f} differs from scalar path")
+        print("  ✅ Batched mission phases match scalar path", file=out)
         
         # Test spacecraft position
         ship_pos = engine.get_spacecraft_position(100)
-        print(f"  ✅ Spacecraft position at day 100: {ship_pos}")
+        print(f"  ✅ Spacecraft position at day 100: {ship_pos}", file=out)
+
+        ship_batch = engine.get_spacecraft_positions(sample_times)
+        for t, row in zip(sample_times, ship_batch):
+            if math.dist(row, engine.get_spacecraft_position(t)) > 1e-12:
+                raise AssertionError(f"Batched spacecraft position at t={t:.3f} differs from scalar path")
+        print("  ✅ Batched spacecraft positions match scalar path", file=out)
         
         # Test mission info
         info = engine.get_mission_info(500)
-        print(f"  ✅ Mission info at day 500: phase={info['phase']}")
+        print(f"  ✅ Mission info at day 500: phase={info['phase']}", file=out)
 
         def dist3(a, b):
             dx = a[0] - b[0]
@@ -126,138 +235,190 @@ def test_orbit_engine():
         assert_leg_clearance(schedule.leg_outbound, dt_clear)
         assert_leg_clearance(schedule.leg_inbound, dt_clear)
 
-        print("  ✅ Transfer legs are prograde and collision-free (Lambert)")
+        print("  ✅ Transfer legs are prograde and collision-free (Lambert)", file=out)
 
         
-        print("✅ Orbit Engine tests passed!\n")
+        print("✅ Orbit Engine tests passed!\n", file=out)
         return True
         
     except Exception as e:
-        print(f"❌ Orbit Engine test failed: {e}\n")
-        import traceback
-        traceback.print_exc()
+        print(f"❌ Orbit Engine test failed: {e}\n", file=out)
+        traceback.print_exc(file=out)
         return False
 
-def test_dependencies():
-    print("Testing Dependencies...")
+def test_dependencies(out=None):
+    print("Testing Dependencies...", file=out)
     try:
-        import numpy
-        print(f"  ✅ NumPy version: {numpy.__version__}")
-        
-        import fastapi
-        print(f"  ✅ FastAPI version: {fastapi.__version__}")
-        
-        import uvicorn
-        print(f"  ✅ Uvicorn version: {uvicorn.__version__}")
-        
-        import websockets
-        ws_version = getattr(websockets, "__version__", None)
-        if not ws_version:
-            try:
-                from importlib.metadata import version as pkg_version
-                ws_version = pkg_version("websockets")
-            except Exception:
-                ws_version = "unknown"
-        print(f"  ✅ WebSockets version: {ws_version}")
-        
-        print("✅ All dependencies installed!\n")
-        return True
-        
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}\n")
-        print("Please run: pip install -r requirements.txt\n")
+        found = _probe_dependencies([module for module, _ in _DEPENDENCIES])
+    except RuntimeError as e:
+        print(f"❌ {e}\n", file=out)
+        return False
+
+    missing = [found[module]["error"] for module, _ in _DEPENDENCIES if "error" in found[module]]
+    if missing:
+        print(f"❌ Missing dependency: {'; '.join(missing)}\n", file=out)
+        print("Please run: pip install -r requirements.txt\n", file=out)
         return False
 
-def test_fastapi_import():
-    print("Testing FastAPI Application...")
+    for module, label in _DEPENDENCIES:
+        print(f"  ✅ {label} version: {found[module]['version']}", file=out)
+
+    print("✅ All dependencies installed!\n", file=out)
+    return True
+
+def test_fastapi_import(out=None):
+    print("Testing FastAPI Application...", file=out)
     try:
-        from main import app
-        print(f"  ✅ FastAPI app created successfully")
-        print(f"  ✅ App title: {app.title}")
+        _load_backend_module('orbit_engine')  # main.py does `from orbit_engine import OrbitEngine`
+        app = _load_backend_module('main').app
+        print(f"  ✅ FastAPI app created successfully", file=out)
+        print(f"  ✅ App title: {app.title}", file=out)
         
-        # Check routes
-        routes = [route.path for route in app.routes]
-        print(f"  ✅ Available routes: {len(routes)}")
+        # Check routes (count only; no per-route attribute access)
+        print(f"  ✅ Available routes: {len(app.routes)}", file=out)
         
-        print("✅ FastAPI tests passed!\n")
+        print("✅ FastAPI tests passed!\n", file=out)
         return True
         
     except Exception as e:
-        print(f"❌ FastAPI test failed: {e}\n")
-        import traceback
-        traceback.print_exc()
+        print(f"❌ FastAPI test failed: {e}\n", file=out)
+        traceback.print_exc(file=out)
         return False
 
-def test_frontend_files():
-    print("Testing Frontend Files...")
-    import os
-    
+def test_frontend_files(out=None):
+    print("Testing Frontend Files...", file=out)
+
+    frontend_dir = 'frontend'
     required_files = [
-        'frontend/index.html',
-        'frontend/styles.css',
-        'frontend/main.js',
-        'frontend/orbit.js',
-        'frontend/spacecraft.js',
-        'frontend/controls.js',
-        'frontend/ui.js'
+        'index.html',
+        'styles.css',
+        'main.js',
+        'orbit.js',
+        'spacecraft.js',
+        'controls.js',
+        'ui.js'
     ]
-    
+
+    # One directory listing instead of a stat() per required file
+    present = set()
+    if os.path.isdir(frontend_dir):
+        with os.scandir(frontend_dir) as entries:
+            present = {entry.name for entry in entries if entry.is_file()}
+
     all_exist = True
-    for file_path in required_files:
-        if os.path.exists(file_path):
-            print(f"  ✅ {file_path}")
+    for file_name in required_files:
+        file_path = f"{frontend_dir}/{file_name}"
+        if file_name in present:
+            print(f"  ✅ {file_path}", file=out)
         else:
-            print(f"  ❌ {file_path} - NOT FOUND")
+            print(f"  ❌ {file_path} - NOT FOUND", file=out)
             all_exist = False
     
     if all_exist:
-        print("✅ All frontend files present!\n")
+        print("✅ All frontend files present!\n", file=out)
         return True
     else:
-        print("❌ Some frontend files missing!\n")
+        print("❌ Some frontend files missing!\n", file=out)
         return False
 
-def main():
-    print("=" * 60)
-    print("Mars Mission 3D Visualization - Test Suite")
-    print("=" * 60)
-    print()
-    
-    results = []
-    
-    # Run tests
-    results.append(("Dependencies", test_dependencies()))
-    results.append(("Frontend Files", test_frontend_files()))
-    results.append(("Orbit Engine", test_orbit_engine()))
-    results.append(("FastAPI", test_fastapi_import()))
+def write_junit_report(path, test_names, passed_mask, skipped_mask, logs):
+    """Writes the results (bit i of each mask = test_names[i]) and per-test logs as a JUnit XML testsuite."""
+    failed_mask = ((1 << len(test_names)) - 1) & ~(passed_mask | skipped_mask)
+    suite = ET.Element(
+        "testsuite",
+        name="mars_mission.test",
+        tests=str(len(test_names)),
+        failures=str(failed_mask.bit_count()),
+        skipped=str(skipped_mask.bit_count()),
+    )
+    for i, test_name in enumerate(test_names):
+        case = ET.SubElement(suite, "testcase", classname="test", name=test_name)
+        if (skipped_mask >> i) & 1:
+            ET.SubElement(case, "skipped", message="prerequisite failed")
+        elif (failed_mask >> i) & 1:
+            ET.SubElement(case, "failure", message=f"{test_name} failed")
+        ET.SubElement(case, "system-out").text = logs[test_name]
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mars Mission 3D Visualization self-check")
+    parser.add_argument("--junit", nargs="?", const="results.xml", metavar="PATH",
+                        help="also write a JUnit XML report (default path: results.xml)")
+    args = parser.parse_args(argv)
+
+    write = sys.stdout.write
+    write(_RULE + "Mars Mission 3D Visualization - Test Suite\n" + _RULE + "\n")
+
+    tests = [
+        ("Dependencies", test_dependencies),
+        ("Frontend Files", test_frontend_files),
+        ("Orbit Engine", test_orbit_engine),
+        ("FastAPI", test_fastapi_import),
+    ]
+
+    # Run tests concurrently in waves: a test starts once its prerequisites have finished, and is
+    # skipped (result None) if any of them did not pass. Each test writes to its own buffer so the
+    # logs stay in declaration order.
+    buffers = {test_name: io.StringIO() for test_name, _ in tests}
+    outcomes = {}
+    pending = list(tests)
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        while pending:
+            ready = [(name, test) for name, test in pending if all(p in outcomes for p in _PREREQUISITES.get(name, ()))]
+            if not ready:
+                raise RuntimeError(f"Unresolvable test prerequisites: {[name for name, _ in pending]}")
+            runnable = []
+            for name, test in ready:
+                failed = [p for p in _PREREQUISITES.get(name, ()) if not outcomes[p]]
+                if failed:
+                    print(f"Skipping {name}: requires {', '.join(failed)}\n", file=buffers[name])
+                    outcomes[name] = None
+                else:
+                    runnable.append((name, test))
+            futures = {name: executor.submit(test, out=buffers[name]) for name, test in runnable}
+            for name, future in futures.items():
+                outcomes[name] = future.result()
+            pending = [item for item in pending if item[0] not in outcomes]
+    test_names = tuple(test_name for test_name, _ in tests)
+    for test_name in test_names:
+        write(buffers[test_name].getvalue())
+
+    # Results as bitmasks: bit i is set when test_names[i] passed / was skipped
+    passed_mask = skipped_mask = 0
+    for i, test_name in enumerate(test_names):
+        if outcomes[test_name] is None:
+            skipped_mask |= 1 << i
+        else:
+            passed_mask |= int(bool(outcomes[test_name])) << i
     
     # Summary
-    print("=" * 60)
-    print("Test Summary")
-    print("=" * 60)
+    write(_RULE + "Test Summary\n" + _RULE)
     
-    passed = sum(1 for _, result in results if result)
-    total = len(results)
+    passed = passed_mask.bit_count()
+    total = len(test_names)
     
-    for test_name, result in results:
-        status = "✅ PASS" if result else "❌ FAIL"
-        print(f"{test_name:.<40} {status}")
+    for i, test_name in enumerate(test_names):
+        if (skipped_mask >> i) & 1:
+            status = _SKIP
+        elif (passed_mask >> i) & 1:
+            status = _PASS
+        else:
+            status = _FAIL
+        write(f"{test_name:.<40} {status}")
     
-    print()
-    print(f"Total: {passed}/{total} tests passed")
-    print()
+    write(f"\nTotal: {passed}/{total} tests passed\n\n")
     
     if passed == total:
-        print("🎉 All tests passed! System is ready to run.")
-        print()
-        print("To start the application, run:")
-        print("  ./start.sh")
-        print("  or")
-        print("  cd backend && python3 main.py")
+        write(_ALL_PASSED)
     else:
-        print("⚠️  Some tests failed. Please fix the issues above.")
+        write(_SOME_FAILED)
     
-    print("=" * 60)
+    write(_RULE)
+
+    if args.junit:
+        write_junit_report(args.junit, test_names, passed_mask, skipped_mask,
+                           {name: buf.getvalue() for name, buf in buffers.items()})
+        write(f"JUnit report written to {args.junit}\n")
     
     return 0 if passed == total else 1
 